@@ -4,7 +4,7 @@ Fase 1: Basic configuration for Instagram scraping
 """
 
 import os
-from typing import Optional
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -15,6 +15,13 @@ class Settings(BaseSettings):
     instagram_username: str = ""
     instagram_password: str = ""
     
+    # Multi-account session pool (JSON list of {"username", "password"}; empty = single account above)
+    instagram_accounts_file: str = ""
+    session_pool_strategy: str = "round_robin"  # round_robin or lru
+    account_cooldown_seconds: int = 900  # Doubles per consecutive failure
+    account_cooldown_max_seconds: int = 14400
+    account_rotation_timeout: int = 10  # Seconds a blocked browser waits for another account
+    
     # Database
     database_url: str = "sqlite:///./pocket.db"
     
@@ -31,6 +38,60 @@ class Settings(BaseSettings):
     max_retries: int = 3
     session_timeout: int = 300
     
+    # Browser startup
+    chrome_headless: bool = False
+    page_load_strategy: str = "eager"  # normal, eager or none
+    chrome_user_data_dir: str = ""  # e.g. ./sessions/chrome; persistent profile-N dirs keep cookies across restarts
+    chromedriver_path: str = ""  # Explicit driver binary (skips webdriver-manager)
+    chromedriver_cache_file: str = "./sessions/chromedriver_path.txt"
+    
+    # Browserless HTTP extraction (falls back to Selenium on failure or login wall)
+    http_fetch_enabled: bool = True
+    http_fetch_timeout: int = 10
+    http_pool_size: int = 10
+    
+    # Profile result cache ("disk", "redis" via redis_url, or "none")
+    profile_cache_backend: str = "disk"
+    profile_cache_dir: str = "./cache/profiles"
+    profile_cache_ttl: int = 3600  # Seconds a result is served as fresh
+    profile_cache_stale_ttl: int = 21600  # Further seconds it is served stale while refreshing
+    
+    # Network-level resource blocking (Chrome DevTools Protocol)
+    block_resources_enabled: bool = True
+    block_resource_types: List[str] = ["image", "media", "font"]  # image, media, font, stylesheet
+    block_url_patterns: List[str] = [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*connect.facebook.net*",
+        "*facebook.com/tr*",
+        "*/logging_client_events*",
+        "*/ajax/bz*",
+    ]
+    
+    # Post grid extraction
+    post_grid_max_posts: int = 0  # 0 = no limit
+    post_grid_max_idle_scrolls: int = 3  # Stop after this many scrolls without new posts
+    post_grid_pinned_posts: int = 3  # Older posts tolerated before a date cutoff stops the scan
+    
+    # Page readiness (adaptive wait timeouts, seconds)
+    page_ready_timeout_min: float = 3.0
+    page_ready_timeout_max: float = 20.0
+    
+    # Anti-bot pacing (random pauses; navigation pauses use scraping_delay as upper bound)
+    pacing_enabled: bool = True
+    pacing_action_min: float = 0.1
+    pacing_action_max: float = 0.6
+    
+    # Browser Pool
+    browser_pool_size: int = 2
+    browser_max_pages: int = 100  # Recycle a browser after this many page loads
+    browser_max_memory_mb: int = 1024  # Recycle a browser above this memory usage (0 disables)
+    browser_checkout_timeout: int = 300  # Seconds to wait for a free browser
+    
+    # Metrics (Prometheus /metrics served by batch processes; 0 disables)
+    metrics_port: int = 0
+    
     # File Storage
     upload_dir: str = "./uploads"
     export_dir: str = "./exports"
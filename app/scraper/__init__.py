@@ -3,5 +3,13 @@ Pocket - Instagram Scraper Module
 """
 
 from .instagram_scraper import InstagramScraper, analyze_instagram_profile
+from .browser_pool import BrowserPool, BrowserPoolTimeout, analyze_profiles
+from .async_scraper import AsyncScraper
+from .http_fetcher import HttpProfileFetcher, get_http_fetcher
+from .profile_cache import ProfileCache, get_profile_cache
+from .session_pool import Account, RateLimitedError, SessionPool, SessionPoolExhausted
 
-__all__ = ['InstagramScraper', 'analyze_instagram_profile']
+__all__ = ['InstagramScraper', 'analyze_instagram_profile', 'BrowserPool', 'BrowserPoolTimeout', 'analyze_profiles', 'AsyncScraper',
+           'HttpProfileFetcher', 'get_http_fetcher',
+           'ProfileCache', 'get_profile_cache',
+           'Account', 'RateLimitedError', 'SessionPool', 'SessionPoolExhausted']
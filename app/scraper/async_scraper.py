@@ -0,0 +1,90 @@
+"""
+Pocket - Async Scraper
+asyncio front-end over the browser pool: blocking Selenium calls run in a
+bounded executor so one event loop keeps many page loads in flight
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Optional, Tuple, Union
+from .browser_pool import BrowserPool, analyze_with_pool
+
+logger = logging.getLogger(__name__)
+
+Result = Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]
+
+
+async def _aiter(usernames: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+    if hasattr(usernames, '__aiter__'):
+        async for username in usernames:
+            yield username
+    else:
+        for username in usernames:
+            yield username
+
+
+class AsyncScraper:
+    """
+    Async profile analysis on a BrowserPool.
+
+    Executor threads only block on the pool and the network, so `max_threads`
+    bounds how many analyses are in flight; HTTP-only fetches and browser
+    checkouts overlap freely within that bound.
+    """
+
+    def __init__(self, pool: BrowserPool = None, max_threads: int = None):
+        self._owns_pool = pool is None
+        self.pool = pool or BrowserPool()
+        self.max_threads = max_threads or max(4, self.pool.size * 2)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_threads, thread_name_prefix="async-scraper")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def analyze_profile(self, username: str) -> Dict[str, Any]:
+        """Analyze one profile without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, analyze_with_pool, self.pool, username)
+
+    async def _analyze_result(self, username: str) -> Result:
+        try:
+            return username, await self.analyze_profile(username), None
+        except Exception as e:
+            return username, None, e
+
+    async def analyze_many(self, usernames: Union[Iterable[str], AsyncIterable[str]],
+                           concurrency: int = None) -> AsyncIterator[Result]:
+        """
+        Yield (username, profile_data, error) as analyses finish. At most
+        `concurrency` run at once and the next username is only pulled from
+        `usernames` when a slot frees (and the consumer has taken the result),
+        so a slow consumer or an unbounded async source applies backpressure.
+        """
+        concurrency = max(1, min(concurrency or self.pool.size, self.max_threads))
+        pending = set()
+        try:
+            async for username in _aiter(usernames):
+                while len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.ensure_future(self._analyze_result(username)))
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # Consumer stopped early: drop queued work (threads already running finish on their own)
+            for task in pending:
+                task.cancel()
+
+    async def close(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._executor.shutdown, True)
+        if self._owns_pool:
+            await loop.run_in_executor(None, self.pool.close)
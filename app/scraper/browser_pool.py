@@ -0,0 +1,293 @@
+"""
+Pocket - Browser Pool
+Reusable, logged-in Chrome instances shared by concurrent profile analysis
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.config.settings import get_settings
+from .http_fetcher import LoginWallError, get_http_fetcher, http_refresher
+from .instagram_scraper import InstagramScraper
+from .metrics import ACCOUNT_ROTATIONS, PROFILES
+from .profile_cache import get_profile_cache
+from .session_pool import RateLimitedError, SessionPool, SessionPoolExhausted
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPoolTimeout(Exception):
+    """No browser became available within the checkout timeout"""
+
+
+class BrowserPool:
+    """
+    Pool of initialized InstagramScraper instances.
+
+    Browsers are started lazily up to `size`, health-checked on checkout and
+    recycled after `max_pages` page loads or above `max_memory_mb`. With a
+    session pool each browser leases its own account for its lifetime.
+    """
+
+    def __init__(self, size: int = None, max_pages: int = None, max_memory_mb: int = None,
+                 factory: Callable[[], InstagramScraper] = None, sessions: SessionPool = None):
+        settings = get_settings()
+        if sessions is None and settings.instagram_accounts_file:
+            sessions = SessionPool()
+        self.sessions = sessions
+        self.size = size or settings.browser_pool_size
+        self.max_pages = max_pages if max_pages is not None else settings.browser_max_pages
+        self.max_memory_mb = max_memory_mb if max_memory_mb is not None else settings.browser_max_memory_mb
+        self.factory = factory or InstagramScraper
+
+        self._idle: List[InstagramScraper] = []  # LIFO, so the warmest browser is reused first
+        self._lock = threading.Lock()
+        # Notified whenever a browser is returned or a slot is freed
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self._closed = False
+        self.stats = {'created': 0, 'recycled': 0, 'unhealthy': 0, 'checkouts': 0, 'rotations': 0}
+
+    def __enter__(self):
+        """Context manager entry"""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit"""
+        self.close()
+
+    def _start_browser(self) -> InstagramScraper:
+        """Start a new browser (the slot is already reserved in self._created)"""
+        scraper = None
+        account = None
+        try:
+            scraper = self.factory()
+            if self.sessions:
+                account = self.sessions.acquire()
+                scraper.use_account(account)
+            scraper.init()
+            scraper.ensure_logged_in()
+        except Exception:
+            if scraper is not None:
+                # Quit Chrome and free its profile directory if init() got that far
+                try:
+                    scraper.close()
+                except Exception as e:
+                    logger.warning(f"Error closing browser that failed to start: {e}")
+            if account:
+                self.sessions.release(account, 'error')
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+        with self._lock:
+            self.stats['created'] += 1
+        logger.info(f"Browser pool started browser ({self._created}/{self.size})")
+        return scraper
+
+    def _discard(self, scraper: InstagramScraper):
+        """Quit a browser and free its slot (and account lease)"""
+        scraper.close()
+        if self.sessions and scraper.account:
+            self.sessions.release(scraper.account)
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    def _needs_recycling(self, scraper: InstagramScraper) -> bool:
+        """Check page and memory budgets of a returned browser"""
+        if self.max_pages and scraper.pages_loaded >= self.max_pages:
+            logger.info(f"Recycling browser after {scraper.pages_loaded} pages")
+            return True
+        if self.max_memory_mb:
+            memory_mb = scraper.memory_usage_mb()
+            if memory_mb > self.max_memory_mb:
+                logger.info(f"Recycling browser using {memory_mb:.0f}MB (limit {self.max_memory_mb}MB)")
+                return True
+        return False
+
+    def checkout(self, timeout: float = None) -> InstagramScraper:
+        """Take a healthy browser from the pool, starting one if below capacity"""
+        timeout = timeout if timeout is not None else get_settings().browser_checkout_timeout
+        deadline = time.monotonic() + timeout
+
+        while True:
+            with self._available:
+                # Re-check both an idle browser and a free slot after every wakeup:
+                # a discarded browser frees a slot without returning anything to _idle
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Browser pool is closed")
+                    if self._idle:
+                        scraper, start = self._idle.pop(), False
+                        break
+                    if self._created < self.size:
+                        self._created += 1
+                        scraper, start = None, True
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise BrowserPoolTimeout(f"No browser available after {timeout}s")
+                    self._available.wait(remaining)
+            if start:
+                scraper = self._start_browser()
+
+            if scraper.is_healthy():
+                with self._lock:
+                    self.stats['checkouts'] += 1
+                return scraper
+
+            logger.warning("Discarding unhealthy browser from pool")
+            with self._lock:
+                self.stats['unhealthy'] += 1
+            self._discard(scraper)
+
+    def checkin(self, scraper: InstagramScraper, discard: bool = False):
+        """Return a browser to the pool (or quit it when broken or over budget)"""
+        if self.sessions and scraper.account is None:
+            # Lost its lease (failed rotation): reusing it would silently log in
+            # with the single account from settings instead of a pooled one
+            discard = True
+        if self._closed or discard or self._needs_recycling(scraper):
+            if not discard and not self._closed:
+                with self._lock:
+                    self.stats['recycled'] += 1
+            self._discard(scraper)
+            return
+        with self._available:
+            if not self._closed:
+                self._idle.append(scraper)
+                self._available.notify()
+                return
+        self._discard(scraper)  # closed while we checked the budgets
+
+    def rotate_account(self, scraper: InstagramScraper, error: Exception) -> bool:
+        """
+        Move a blocked browser to another account; False without a session pool or
+        when no other account frees up within account_rotation_timeout. Unless the
+        rotation succeeds the browser is left without an account and is discarded
+        on checkin.
+        """
+        if not self.sessions or not scraper.account:
+            return False
+        outcome = 'rate_limited' if isinstance(error, RateLimitedError) else 'login_wall'
+        blocked = scraper.account
+        # rotate() releases the lease first, so the browser must stop using it even if no new one comes
+        scraper.account = None
+        try:
+            account = self.sessions.rotate(blocked, outcome, timeout=get_settings().account_rotation_timeout)
+        except SessionPoolExhausted as e:
+            logger.warning(f"No account to rotate to from {blocked.username}: {e}")
+            return False
+        logger.info(f"Rotating browser from {blocked.username} to {account.username} after {outcome}")
+        try:
+            scraper.use_account(account)
+            scraper.ensure_logged_in()
+        except Exception:
+            scraper.account = None
+            self.sessions.release(account, 'error')
+            raise
+        with self._lock:
+            self.stats['rotations'] += 1
+        ACCOUNT_ROTATIONS.labels(outcome=outcome).inc()
+        return True
+
+    @contextmanager
+    def browser(self, timeout: float = None) -> Iterator[InstagramScraper]:
+        """Check out a browser for the duration of a with-block"""
+        scraper = self.checkout(timeout)
+        broken = False
+        try:
+            yield scraper
+        except Exception:
+            broken = not scraper.is_healthy()
+            raise
+        finally:
+            self.checkin(scraper, discard=broken)
+
+    def close(self):
+        """Quit all idle browsers; browsers still checked out are quit on checkin"""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for scraper in idle:
+            self._discard(scraper)
+        logger.info(f"Browser pool closed (stats: {self.stats})")
+
+
+def _fetch_profile(pool: BrowserPool, username: str) -> Dict[str, Any]:
+    """
+    Plain HTTP first so the browser is only checked out when needed, rotating accounts
+    on blocks. HTTP uses the single-account session file, so it is skipped when the
+    pool leases accounts from a session pool (their cooldowns would be bypassed).
+    """
+    if get_settings().http_fetch_enabled and not pool.sessions:
+        profile_data = get_http_fetcher().fetch_profile(username)
+        if profile_data:
+            PROFILES.labels(source='http', status='ok').inc()
+            return profile_data
+    try:
+        with pool.browser() as scraper:
+            try:
+                profile_data = scraper.analyze_profile(username, try_http=False, use_cache=False)
+            except (LoginWallError, RateLimitedError) as e:
+                if not pool.rotate_account(scraper, e):
+                    raise
+                profile_data = scraper.analyze_profile(username, try_http=False, use_cache=False)
+    except Exception:
+        PROFILES.labels(source='browser', status='error').inc()
+        raise
+    PROFILES.labels(source='browser', status='ok').inc()
+    return profile_data
+
+
+def analyze_with_pool(pool: BrowserPool, username: str) -> Dict[str, Any]:
+    """Analyze one profile on a pooled browser (through the result cache when enabled)"""
+    cache = get_profile_cache()
+    if cache is None:
+        return _fetch_profile(pool, username)
+    # Refresh over HTTP only: the pool may be busy or closed when a background refresh runs.
+    # Not with a session pool, whose accounts the single-account HTTP session would bypass
+    refresh = None if pool.sessions else http_refresher(username)
+    return cache.get_or_fetch(username, lambda: _fetch_profile(pool, username), refresh=refresh)
+
+
+def analyze_profiles(usernames: Iterable[str], pool: BrowserPool = None,
+                     max_workers: int = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Analyze many profiles concurrently on pooled browsers.
+    Yields (username, profile_data, error) as each analysis finishes.
+    """
+    owns_pool = pool is None
+    pool = pool or BrowserPool()
+
+    max_workers = max_workers or pool.size
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Submit lazily with a bounded number in flight, so huge (or streamed)
+            # username lists are never materialized as futures all at once
+            pending = {}
+            usernames = iter(usernames)
+            while True:
+                for username in usernames:
+                    pending[executor.submit(analyze_with_pool, pool, username)] = username
+                    if len(pending) >= max_workers * 2:
+                        break
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    username = pending.pop(future)
+                    try:
+                        yield username, future.result(), None
+                    except Exception as e:
+                        yield username, None, e
+    finally:
+        if owns_pool:
+            pool.close()
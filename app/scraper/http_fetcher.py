@@ -0,0 +1,143 @@
+"""
+Pocket - HTTP Profile Fetcher
+Browserless extraction of profile meta tags using the saved Selenium session cookies
+"""
+
+import json
+import os
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from app.config.settings import get_settings
+from .metrics import HTTP_FALLBACKS
+from .parsing import extract_meta_tags, parse_meta_tags
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+class LoginWallError(Exception):
+    """Instagram answered with a login wall instead of the profile page"""
+
+
+class BrowserNeededError(Exception):
+    """The profile could not be extracted without a browser"""
+
+
+class HttpProfileFetcher:
+    """
+    Fetch profile pages over plain HTTP with a pooled requests.Session.
+
+    Cookies come from the session file written by InstagramScraper.save_session
+    and are reloaded whenever that file changes.
+    """
+
+    def __init__(self, session_file: str = "sessions/instagram_session.json", pool_size: int = None):
+        self.settings = get_settings()
+        self.session_file = session_file
+        self._session_mtime = None
+        self._lock = threading.Lock()
+
+        pool_size = pool_size or self.settings.http_pool_size
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+
+    def _load_cookies(self):
+        """(Re)load cookies from the session file when it changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.session_file)
+        except OSError:
+            return
+
+        with self._lock:
+            if mtime == self._session_mtime:
+                return
+            try:
+                with open(self.session_file, 'r') as f:
+                    session_data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to read session cookies: {e}")
+                return
+
+            self.session.cookies.clear()
+            for cookie in session_data.get('cookies', []):
+                self.session.cookies.set(
+                    cookie['name'], cookie['value'],
+                    domain=cookie.get('domain', '.instagram.com'),
+                    path=cookie.get('path', '/')
+                )
+            self._session_mtime = mtime
+            logger.info(f"Loaded {len(session_data.get('cookies', []))} cookies from {self.session_file}")
+
+    def fetch_html(self, username: str) -> str:
+        """GET the profile page; raises LoginWallError when redirected to login"""
+        self._load_cookies()
+        response = self.session.get(
+            f"https://www.instagram.com/{username}/",
+            timeout=self.settings.http_fetch_timeout
+        )
+
+        if '/accounts/login' in response.url or response.status_code in (401, 403, 429):
+            raise LoginWallError(f"Login wall for @{username} (HTTP {response.status_code})")
+        response.raise_for_status()
+        return response.text
+
+    def fetch_profile(self, username: str) -> Optional[Dict[str, Any]]:
+        """Profile data from the page meta tags, or None when the browser path is needed"""
+        try:
+            html = self.fetch_html(username)
+            profile_data = parse_meta_tags(extract_meta_tags(html))
+            if profile_data is None:
+                HTTP_FALLBACKS.labels(reason='no_meta_tags').inc()
+                logger.info(f"No profile meta tags for @{username} over HTTP, falling back to browser")
+            return profile_data
+
+        except LoginWallError as e:
+            HTTP_FALLBACKS.labels(reason='login_wall').inc()
+            logger.info(f"{e}, falling back to browser")
+            return None
+        except requests.RequestException as e:
+            HTTP_FALLBACKS.labels(reason='error').inc()
+            logger.warning(f"HTTP fetch failed for @{username}: {e}")
+            return None
+
+    def close(self):
+        self.session.close()
+
+
+_fetchers: Dict[str, HttpProfileFetcher] = {}
+_fetchers_lock = threading.Lock()
+
+
+def get_http_fetcher(session_file: str = "sessions/instagram_session.json") -> HttpProfileFetcher:
+    """Shared fetcher (and connection pool) per session file"""
+    with _fetchers_lock:
+        if session_file not in _fetchers:
+            _fetchers[session_file] = HttpProfileFetcher(session_file)
+        return _fetchers[session_file]
+
+
+def http_refresher(username: str, session_file: str = "sessions/instagram_session.json") -> Optional[Callable[[], Dict[str, Any]]]:
+    """
+    Background cache refresh for username over plain HTTP (None when HTTP fetching is
+    disabled). It never touches a browser, so it is safe beside any scraper; when the
+    page needs one it raises BrowserNeededError and the stale entry is kept.
+    """
+    if not get_settings().http_fetch_enabled:
+        return None
+
+    def refresh() -> Dict[str, Any]:
+        profile_data = get_http_fetcher(session_file).fetch_profile(username)
+        if not profile_data:
+            raise BrowserNeededError(f"@{username} needs the browser")
+        return profile_data
+    return refresh
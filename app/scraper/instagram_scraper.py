@@ -7,30 +7,91 @@ import time
 import json
 import os
 import logging
-import re
-from typing import Dict, List, Optional, Any
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Any
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from app.config.settings import get_settings
+from .http_fetcher import LoginWallError, get_http_fetcher, http_refresher
+from .profile_cache import get_profile_cache
+from .session_pool import Account, RateLimitedError
+from .network import TRANSFER_STATS_SCRIPT, TransferStats, blocked_url_patterns, enable_resource_blocking
+from .parsing import detect_block, parse_embedded_json, parse_grid_item, parse_meta_tags, parse_number, parse_page_text
+from .startup import claim_profile_dir, forget_chromedriver_path, release_profile_dir, resolve_chromedriver_path
+from .readiness import (
+    AdaptiveTimeout, PacingPolicy, StepTimer,
+    any_of, document_ready, element_present, meta_tag_present, network_idle, url_changed, url_contains
+)
+
+try:
+    import psutil
+except ImportError:  # Optional: memory-based browser recycling falls back to JS heap size
+    psutil = None
 
 logger = logging.getLogger(__name__)
 
+# Everything the extraction methods need (plus transfer stats), collected in the page
+# so it costs a single WebDriver round-trip instead of one per element/attribute
+PAGE_SNAPSHOT_SCRIPT = """
+var meta = {};
+document.querySelectorAll('meta').forEach(function (m) {
+    var key = m.getAttribute('property') || m.getAttribute('name');
+    if (key && m.content && !(key in meta)) { meta[key] = m.content; }
+});
+var json = [];
+document.querySelectorAll('script:not([src])').forEach(function (s) {
+    var text = s.textContent;
+    if (text && text.indexOf('"username"') !== -1) { json.push(text); }
+});
+return {
+    meta: meta,
+    text: document.body ? document.body.innerText : null,
+    json: json.join('\\n'),
+    transfer: (function () {""" + TRANSFER_STATS_SCRIPT + """})()
+};
+"""
+
+# Post links not returned yet (marked so each grid cell is read once), then scroll on
+POST_GRID_SCRIPT = """
+var items = [];
+document.querySelectorAll(arguments[0]).forEach(function (a) {
+    if (a.dataset.pocketSeen) { return; }
+    a.dataset.pocketSeen = '1';
+    var img = a.querySelector('img');
+    items.push({href: a.getAttribute('href'), alt: img ? img.alt : '', overlay: a.innerText});
+});
+window.scrollBy(0, window.innerHeight * 2);
+return items;
+"""
+
+POST_LINK_SELECTOR = 'main a[href*="/p/"], main a[href*="/reel/"]'
+NEW_POST_LINK_SELECTOR = 'main a[href*="/p/"]:not([data-pocket-seen]), main a[href*="/reel/"]:not([data-pocket-seen])'
+
 
 class InstagramScraper:
     """
     Instagram scraper that works with current Instagram structure
     """
     
-    def __init__(self):
+    def __init__(self, account: Account = None):
         self.settings = get_settings()
         self.driver: Optional[webdriver.Chrome] = None
         self.is_logged_in = False
-        self.session_file = "sessions/instagram_session.json"
+        self.account: Optional[Account] = account
+        self.session_file = account.session_file if account else "sessions/instagram_session.json"
+        self.pages_loaded = 0
+        self.timer = StepTimer()
+        self.transfer = TransferStats()
+        self.timeouts = AdaptiveTimeout(self.timer)
+        self.pacing = PacingPolicy()
+        self._browser_lock = threading.RLock()
+        self.profile_dir: Optional[str] = None
         
     def __enter__(self):
         """Context manager entry"""
@@ -43,9 +104,18 @@ class InstagramScraper:
     
     def init(self):
         """Initialize Selenium driver"""
+        start = time.perf_counter()
         try:
             # Chrome options for stealth
             chrome_options = Options()
+            if self.settings.chrome_headless:
+                chrome_options.add_argument('--headless=new')
+                chrome_options.add_argument('--window-size=1280,900')
+            # eager: driver.get returns at DOMContentLoaded; readiness waits cover the rest
+            chrome_options.page_load_strategy = self.settings.page_load_strategy
+            if self.settings.chrome_user_data_dir:
+                self.profile_dir = claim_profile_dir(self.settings.chrome_user_data_dir)
+                chrome_options.add_argument(f'--user-data-dir={self.profile_dir}')
             chrome_options.add_argument('--no-sandbox')
             chrome_options.add_argument('--disable-setuid-sandbox')
             chrome_options.add_argument('--disable-dev-shm-usage')
@@ -55,7 +125,6 @@ class InstagramScraper:
             chrome_options.add_argument('--disable-features=site-per-process')
             chrome_options.add_argument('--disable-extensions')
             chrome_options.add_argument('--disable-plugins')
-            chrome_options.add_argument('--disable-images')
             chrome_options.add_argument('--disable-javascript')
             chrome_options.add_argument('--disable-default-apps')
             chrome_options.add_argument('--disable-sync')
@@ -76,8 +145,25 @@ class InstagramScraper:
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
             # Create driver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            with self.timer.step('startup:driver_path'):
+                service = Service(resolve_chromedriver_path())
+            with self.timer.step('startup:launch'):
+                try:
+                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+                except SessionNotCreatedException as e:
+                    if self.settings.chromedriver_path:
+                        raise
+                    # The cached driver no longer matches Chrome (e.g. after an upgrade): resolve it again once
+                    logger.warning(f"Chrome rejected the cached chromedriver, resolving it again: {e.msg}")
+                    forget_chromedriver_path()
+                    service = Service(resolve_chromedriver_path())
+                    self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            
+            # --disable-images is ignored by current Chrome; block at the network layer instead
+            if self.settings.block_resources_enabled:
+                enable_resource_blocking(self.driver, blocked_url_patterns(
+                    self.settings.block_resource_types, self.settings.block_url_patterns
+                ))
             
             # Execute stealth script
             self.driver.execute_script("""
@@ -86,12 +172,35 @@ class InstagramScraper:
                 });
             """)
             
-            logger.info("Instagram scraper initialized successfully")
+            startup = time.perf_counter() - start
+            self.timer.record('startup', startup)
+            logger.info(f"Instagram scraper initialized successfully in {startup:.2f}s")
             
         except Exception as e:
             logger.error(f"Failed to initialize Instagram scraper: {e}")
+            self._release_profile()
             raise
     
+    def _wait(self, step: str, condition) -> bool:
+        """Wait for condition with an adaptive timeout, recording the step duration"""
+        timeout = self.timeouts.for_step(step)
+        start = time.perf_counter()
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(condition)
+            self.timer.record(step, time.perf_counter() - start)
+            return True
+        except TimeoutException:
+            self.timer.record(f"{step}:timeout", time.perf_counter() - start)
+            logger.warning(f"Timed out after {timeout:.1f}s waiting for {step}")
+            return False
+    
+    def _open(self, url: str, step: str):
+        """Navigate to url (paced), recording navigation time"""
+        self.pacing.navigation()
+        with self.timer.step(f"navigate:{step}"):
+            self.driver.get(url)
+        self.pages_loaded += 1
+    
     def save_session(self):
         """Save current session"""
         try:
@@ -134,8 +243,8 @@ class InstagramScraper:
             if time.time() - session_data['timestamp'] > 24 * 3600:
                 return False
             
-            self.driver.get('https://www.instagram.com/')
-            time.sleep(2)
+            self._open('https://www.instagram.com/', 'home')
+            self._wait('home_ready', document_ready)
             
             for cookie in session_data['cookies']:
                 try:
@@ -144,7 +253,12 @@ class InstagramScraper:
                     continue
             
             self.driver.refresh()
-            time.sleep(3)
+            # Logged-in home renders the nav; an expired session redirects to the login form
+            self._wait('session_restore', any_of(
+                url_contains('/accounts/login/'),
+                element_present('input[name="username"]'),
+                element_present('svg[aria-label="Home"]'),
+            ))
             
             for key, value in session_data['localStorage'].items():
                 try:
@@ -175,39 +289,44 @@ class InstagramScraper:
         try:
             logger.info(f"Logging into Instagram with username: {username}")
             
-            self.driver.get('https://www.instagram.com/')
-            time.sleep(3)
+            self._open('https://www.instagram.com/', 'home')
+            login_form = element_present('input[name="username"]')
+            self._wait('home_ready', any_of(login_form, element_present('a[href="/accounts/login/"]')))
             
-            try:
-                login_link = self.driver.find_element(By.CSS_SELECTOR, 'a[href="/accounts/login/"]')
-                login_link.click()
-                time.sleep(3)
-            except:
-                self.driver.get('https://www.instagram.com/accounts/login/')
-                time.sleep(3)
+            if not login_form(self.driver):
+                try:
+                    login_link = self.driver.find_element(By.CSS_SELECTOR, 'a[href="/accounts/login/"]')
+                    self.pacing.action()
+                    login_link.click()
+                except:
+                    self._open('https://www.instagram.com/accounts/login/', 'login')
             
-            wait = WebDriverWait(self.driver, 10)
+            wait = WebDriverWait(self.driver, self.timeouts.maximum)
             username_field = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'input[name="username"]')))
             password_field = self.driver.find_element(By.CSS_SELECTOR, 'input[name="password"]')
             
             username_field.click()
-            time.sleep(0.5)
             username_field.clear()
-            time.sleep(0.5)
+            self.pacing.action()
             username_field.send_keys(username)
-            time.sleep(1)
+            self.pacing.action()
             
             password_field.click()
-            time.sleep(0.5)
             password_field.clear()
-            time.sleep(0.5)
+            self.pacing.action()
             password_field.send_keys(password)
-            time.sleep(1)
+            self.pacing.action()
             
+            login_url = self.driver.current_url
             submit_button = self.driver.find_element(By.CSS_SELECTOR, 'button[type="submit"]')
             submit_button.click()
             
-            time.sleep(5)
+            # Success navigates away (or renders the nav in place); bad credentials show an alert
+            self._wait('login_submit', any_of(
+                url_changed(login_url),
+                element_present('svg[aria-label="Home"]'),
+                element_present('#slfErrorAlert'),
+            ))
             
             current_url = self.driver.current_url
             if '/accounts/login/' in current_url:
@@ -229,35 +348,93 @@ class InstagramScraper:
         if self.load_session():
             return
         
+        if self.account and not username:
+            username, password = self.account.username, self.account.password
         self.login(username, password)
     
-    def analyze_profile(self, username: str) -> Dict[str, Any]:
+    def use_account(self, account: Account):
+        """Switch to another account (its session is restored on the next ensure_logged_in)"""
+        self.account = account
+        self.session_file = account.session_file
+        self.is_logged_in = False
+        if self.driver:
+            self.driver.delete_all_cookies()
+    
+    def _check_blocked(self, snapshot: Dict[str, Any]):
+        """Raise when the page is a login wall/challenge or a rate-limit notice"""
+        current_url = self.driver.current_url
+        block = detect_block(snapshot)
+        if '/accounts/login' in current_url or '/challenge/' in current_url or block == 'login_wall':
+            self.is_logged_in = False
+            raise LoginWallError(f"Login wall at {current_url}")
+        if block == 'rate_limited':
+            raise RateLimitedError("Instagram rate limited this account")
+    
+    def analyze_profile_http(self, username: str) -> Optional[Dict[str, Any]]:
+        """Browserless attempt using the saved session cookies (None if the browser is needed)"""
+        if not self.settings.http_fetch_enabled:
+            return None
+        with self.timer.step('http_fetch'):
+            profile_data = get_http_fetcher(self.session_file).fetch_profile(username)
+        if profile_data:
+            logger.info(f"Extracted @{username} over HTTP without the browser")
+        return profile_data
+    
+    def analyze_profile(self, username: str, try_http: bool = True, use_cache: bool = True) -> Dict[str, Any]:
         """
         Analyze Instagram profile using modern extraction methods
+        (cached result if fresh, else plain HTTP unless try_http is False, then the browser)
         """
+        cache = get_profile_cache() if use_cache else None
+        if cache is None:
+            return self._analyze_profile(username, try_http)
+        # Stale entries are refreshed over HTTP only: this scraper's browser belongs to the caller
+        return cache.get_or_fetch(username, lambda: self._analyze_profile(username, try_http),
+                                  refresh=http_refresher(username, self.session_file))
+    
+    def _analyze_profile(self, username: str, try_http: bool = True) -> Dict[str, Any]:
+        """Uncached analysis; the browser lock serializes threads sharing this scraper"""
+        if try_http:
+            profile_data = self.analyze_profile_http(username)
+            if profile_data:
+                return profile_data
+        
+        with self._browser_lock:
+            return self._analyze_profile_in_browser(username)
+    
+    def _analyze_profile_in_browser(self, username: str) -> Dict[str, Any]:
         self.ensure_logged_in()
         
         try:
             logger.info(f"Analyzing profile: {username}")
             
             profile_url = f"https://www.instagram.com/{username}/"
-            self.driver.get(profile_url)
-            time.sleep(5)
+            self._open(profile_url, 'profile')
+            
+            # og:title is what the meta-tag extraction needs; fall back to network idle
+            # for pages that never render it (missing profile, login wall)
+            if not self._wait('profile_ready', meta_tag_present('og:title')):
+                self._wait('profile_idle', network_idle())
+            
+            # One round-trip for everything the three methods below need
+            snapshot = self._snapshot()
+            self.transfer.record(snapshot.get('transfer'))
+            self._check_blocked(snapshot)
             
             # Method 1: Try to extract from meta tags
-            profile_data = self._extract_from_meta_tags()
+            profile_data = self._extract_from_meta_tags(snapshot)
             if profile_data:
                 logger.info("Successfully extracted data from meta tags")
                 return profile_data
             
             # Method 2: Try to extract from page content
-            profile_data = self._extract_from_page_content()
+            profile_data = self._extract_from_page_content(snapshot)
             if profile_data:
                 logger.info("Successfully extracted data from page content")
                 return profile_data
             
             # Method 3: Try to extract from JavaScript variables
-            profile_data = self._extract_from_js_variables()
+            profile_data = self._extract_from_js_variables(snapshot)
             if profile_data:
                 logger.info("Successfully extracted data from JavaScript variables")
                 return profile_data
@@ -268,190 +445,135 @@ class InstagramScraper:
             logger.error(f"Failed to analyze profile {username}: {e}")
             raise
     
-    def _extract_from_meta_tags(self) -> Optional[Dict[str, Any]]:
-        """Extract profile data from meta tags"""
-        try:
-            meta_tags = self.driver.find_elements(By.CSS_SELECTOR, "meta")
-            
-            profile_data = {
-                'username': '',
-                'full_name': '',
-                'biography': '',
-                'followers': 0,
-                'following': 0,
-                'posts': 0,
-                'is_verified': False,
-                'is_private': False,
-                'profile_pic_url': '',
-                'external_url': ''
-            }
-            
-            for meta in meta_tags:
-                property_attr = meta.get_attribute("property")
-                content = meta.get_attribute("content")
-                
-                if property_attr == "og:title" and content:
-                    # Extract username and full name from title
-                    # Format: "Full Name (@username) • Instagram photos and videos"
-                    match = re.match(r'^(.+?)\s*\(@([^)]+)\)', content)
-                    if match:
-                        profile_data['full_name'] = match.group(1).strip()
-                        profile_data['username'] = match.group(2).strip()
+    def iter_posts(self, username: str, max_posts: int = None, since: datetime = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield posts from the profile grid as it is scrolled, newest first.
+        Stops after max_posts, once posts are older than since (after skipping
+        possibly pinned older posts), or when scrolling stops loading new posts.
+        Only the seen-set of shortcodes is kept, so memory stays flat on long grids.
+        
+        The browser lock is held while a batch is read or scrolled, never across a
+        yield, so slow consumers don't block other users of this scraper; if one of
+        them navigates away in between, iteration raises instead of silently ending.
+        Raises LoginWallError/RateLimitedError when Instagram blocks the page.
+        """
+        max_posts = max_posts if max_posts is not None else self.settings.post_grid_max_posts
+        self.ensure_logged_in()
+        profile_url = f"https://www.instagram.com/{username}/"
+        
+        with self._browser_lock:
+            self._open(profile_url, 'profile')
+            has_grid = self._wait('grid_ready', element_present(POST_LINK_SELECTOR))
+            if not has_grid:
+                # Block pages have no grid either; report them rather than "no posts"
+                self._check_blocked(self._snapshot())
+        if not has_grid:
+            logger.info(f"No post grid for @{username}")
+            return
+        
+        seen = set()
+        yielded = older = idle_scrolls = 0
+        while idle_scrolls < self.settings.post_grid_max_idle_scrolls:
+            with self._browser_lock:
+                if not self.driver.current_url.startswith(profile_url):
+                    raise RuntimeError(f"Left the profile page of @{username} while reading its posts")
+                with self.timer.step('grid_batch'):
+                    items = self.driver.execute_script(POST_GRID_SCRIPT, POST_LINK_SELECTOR) or []
+            
+            for item in items:
+                post = parse_grid_item(item, username)
+                if post is None or post['shortcode'] in seen:
+                    continue
+                seen.add(post['shortcode'])
                 
-                elif property_attr == "og:description" and content:
-                    profile_data['biography'] = content
-                    
-                    # Extract stats from description
-                    # Format: "664M Followers, 623 Following, 3,932 Posts - See Instagram photos..."
-                    followers_match = re.search(r'(\d+(?:\.\d+)?[KMB]?)\s+Followers?', content)
-                    if followers_match:
-                        profile_data['followers'] = self._parse_number(followers_match.group(1))
-                    
-                    following_match = re.search(r'(\d+(?:\.\d+)?[KMB]?)\s+Following', content)
-                    if following_match:
-                        profile_data['following'] = self._parse_number(following_match.group(1))
-                    
-                    posts_match = re.search(r'(\d+(?:\.\d+)?[KMB]?)\s+Posts?', content)
-                    if posts_match:
-                        profile_data['posts'] = self._parse_number(posts_match.group(1))
+                if since and post['posted_at'] and post['posted_at'] < since:
+                    older += 1
+                    if older > self.settings.post_grid_pinned_posts:
+                        logger.info(f"Reached posts older than {since:%Y-%m-%d} for @{username}")
+                        return
+                    continue
                 
-                elif property_attr == "og:image" and content:
-                    profile_data['profile_pic_url'] = content
-            
-            # Check if we got meaningful data
-            if profile_data['username'] and profile_data['full_name']:
-                return {
-                    'profile_info': profile_data,
-                    'posts': [],  # Meta tags don't contain post data
-                    'total_posts': 0,
-                    'scraped_at': time.time()
-                }
-            
-            return None
-            
+                yield post
+                yielded += 1
+                if max_posts and yielded >= max_posts:
+                    return
+            
+            self.pacing.action()
+            with self._browser_lock:
+                if self._wait('grid_more', element_present(NEW_POST_LINK_SELECTOR)):
+                    idle_scrolls = 0
+                else:
+                    # No new posts: end of the grid, or a rate-limit notice replaced it
+                    self._check_blocked(self._snapshot())
+                    idle_scrolls += 1
+        
+        logger.info(f"End of post grid for @{username} after {yielded} posts")
+    
+    def _snapshot(self) -> Dict[str, Any]:
+        """Meta tags, body text and embedded JSON of the current page in one execute_script call"""
+        try:
+            with self.timer.step('snapshot'):
+                snapshot = self.driver.execute_script(PAGE_SNAPSHOT_SCRIPT)
+            return snapshot or {}
+        except Exception as e:
+            logger.error(f"Failed to snapshot page: {e}")
+            return {}
+    
+    def _extract_from_meta_tags(self, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract profile data from meta tags"""
+        try:
+            return parse_meta_tags(snapshot.get('meta') or {})
         except Exception as e:
             logger.error(f"Failed to extract from meta tags: {e}")
             return None
     
-    def _extract_from_page_content(self) -> Optional[Dict[str, Any]]:
+    def _extract_from_page_content(self, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract profile data from page content"""
         try:
-            page_text = self.driver.find_element(By.TAG_NAME, "body").text
-            
-            profile_data = {
-                'username': '',
-                'full_name': '',
-                'biography': '',
-                'followers': 0,
-                'following': 0,
-                'posts': 0,
-                'is_verified': False,
-                'is_private': False,
-                'profile_pic_url': '',
-                'external_url': ''
-            }
-            
-            # Check if account is private
-            if "This account is private" in page_text:
-                profile_data['is_private'] = True
-            
-            # Extract stats from page text
-            followers_match = re.search(r'(\d+(?:\.\d+)?[KMB]?)\s+followers?', page_text, re.IGNORECASE)
-            if followers_match:
-                profile_data['followers'] = self._parse_number(followers_match.group(1))
-            
-            following_match = re.search(r'(\d+(?:\.\d+)?[KMB]?)\s+following', page_text, re.IGNORECASE)
-            if following_match:
-                profile_data['following'] = self._parse_number(following_match.group(1))
-            
-            posts_match = re.search(r'(\d+(?:\.\d+)?[KMB]?)\s+posts?', page_text, re.IGNORECASE)
-            if posts_match:
-                profile_data['posts'] = self._parse_number(posts_match.group(1))
-            
-            # Check if verified
-            if "Verified" in page_text:
-                profile_data['is_verified'] = True
-            
-            return {
-                'profile_info': profile_data,
-                'posts': [],
-                'total_posts': 0,
-                'scraped_at': time.time()
-            }
-            
+            if snapshot.get('text') is None:
+                return None
+            return parse_page_text(snapshot['text'])
         except Exception as e:
             logger.error(f"Failed to extract from page content: {e}")
             return None
     
-    def _extract_from_js_variables(self) -> Optional[Dict[str, Any]]:
+    def _extract_from_js_variables(self, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Extract profile data from JavaScript variables"""
         try:
-            # Look for any JavaScript variables that might contain profile data
-            page_source = self.driver.page_source
-            
-            # Look for patterns like "username": "cristiano"
-            username_match = re.search(r'"username":\s*"([^"]+)"', page_source)
-            if username_match:
-                username = username_match.group(1)
-                
-                profile_data = {
-                    'username': username,
-                    'full_name': '',
-                    'biography': '',
-                    'followers': 0,
-                    'following': 0,
-                    'posts': 0,
-                    'is_verified': False,
-                    'is_private': False,
-                    'profile_pic_url': '',
-                    'external_url': ''
-                }
-                
-                # Try to find other data
-                full_name_match = re.search(r'"full_name":\s*"([^"]+)"', page_source)
-                if full_name_match:
-                    profile_data['full_name'] = full_name_match.group(1)
-                
-                followers_match = re.search(r'"followers":\s*(\d+)', page_source)
-                if followers_match:
-                    profile_data['followers'] = int(followers_match.group(1))
-                
-                following_match = re.search(r'"following":\s*(\d+)', page_source)
-                if following_match:
-                    profile_data['following'] = int(following_match.group(1))
-                
-                posts_match = re.search(r'"posts":\s*(\d+)', page_source)
-                if posts_match:
-                    profile_data['posts'] = int(posts_match.group(1))
-                
-                return {
-                    'profile_info': profile_data,
-                    'posts': [],
-                    'total_posts': 0,
-                    'scraped_at': time.time()
-                }
-            
-            return None
-            
+            return parse_embedded_json(snapshot.get('json') or '')
         except Exception as e:
             logger.error(f"Failed to extract from JS variables: {e}")
             return None
     
     def _parse_number(self, number_str: str) -> int:
         """Parse number string like '664M', '1.2K', '1234' to integer"""
+        return parse_number(number_str)
+    
+    def is_healthy(self) -> bool:
+        """Check that the browser is still alive and responding to commands"""
+        if not self.driver:
+            return False
         try:
-            number_str = number_str.upper().replace(',', '')
-            
-            if 'K' in number_str:
-                return int(float(number_str.replace('K', '')) * 1000)
-            elif 'M' in number_str:
-                return int(float(number_str.replace('M', '')) * 1000000)
-            elif 'B' in number_str:
-                return int(float(number_str.replace('B', '')) * 1000000000)
-            else:
-                return int(float(number_str))
-        except:
-            return 0
+            return self.driver.execute_script("return 1") == 1
+        except Exception as e:
+            logger.warning(f"Browser health check failed: {e}")
+            return False
+    
+    def memory_usage_mb(self) -> float:
+        """Approximate browser memory usage (Chrome process tree RSS, or JS heap without psutil)"""
+        try:
+            if psutil is not None:
+                process = psutil.Process(self.driver.service.process.pid)
+                processes = [process] + process.children(recursive=True)
+                return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+            
+            heap = self.driver.execute_script(
+                "return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0"
+            )
+            return (heap or 0) / (1024 * 1024)
+        except Exception as e:
+            logger.warning(f"Failed to read browser memory usage: {e}")
+            return 0.0
     
     def close(self):
         """Close driver and cleanup"""
@@ -461,6 +583,13 @@ class InstagramScraper:
             logger.info("Instagram scraper closed successfully")
         except Exception as e:
             logger.error(f"Error closing Instagram scraper: {e}")
+        finally:
+            self._release_profile()
+    
+    def _release_profile(self):
+        if self.profile_dir:
+            release_profile_dir(self.profile_dir)
+            self.profile_dir = None
 
 
 # Convenience function
@@ -468,6 +597,16 @@ def analyze_instagram_profile(username: str, instagram_username: str = None, ins
     """
     Convenience function to analyze an Instagram profile
     """
-    with InstagramScraper() as scraper:
-        scraper.ensure_logged_in(instagram_username, instagram_password)
-        return scraper.analyze_profile(username)
+    def fetch() -> Dict[str, Any]:
+        if get_settings().http_fetch_enabled:
+            profile_data = get_http_fetcher().fetch_profile(username)
+            if profile_data:
+                return profile_data
+        
+        with InstagramScraper() as scraper:
+            scraper.ensure_logged_in(instagram_username, instagram_password)
+            return scraper.analyze_profile(username, try_http=False, use_cache=False)
+    
+    cache = get_profile_cache()
+    # fetch() uses its own fetcher and browser, so it can also refresh in the background
+    return cache.get_or_fetch(username, fetch, refresh=fetch) if cache else fetch()
@@ -0,0 +1,46 @@
+"""
+Pocket - Scraper Metrics
+Per-stage timings and counters of the Selenium/HTTP scraper (prometheus_client),
+served from a background HTTP server (settings.metrics_port) for batch processes
+"""
+
+import logging
+from prometheus_client import Counter, Histogram, start_http_server
+
+logger = logging.getLogger(__name__)
+
+# Page loads and waits run far longer than the client's default buckets (which stop at 10s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Scraper pipeline
+STEP_SECONDS = Histogram(
+    "pocket_scraper_step_duration_seconds", "Duration of scraper steps (startup, navigation, waits, extraction)", ["step"],
+    buckets=DEFAULT_BUCKETS,
+)
+PROFILES = Counter(
+    "pocket_scraper_profiles_total", "Profiles analyzed by source (http, browser) and status", ["source", "status"]
+)
+CACHE_LOOKUPS = Counter(
+    "pocket_scraper_cache_lookups_total", "Profile cache lookups by result (hit, stale, miss, shared)", ["result"]
+)
+HTTP_FALLBACKS = Counter(
+    "pocket_scraper_http_fallbacks_total", "Browserless fetches that fell back to the browser", ["reason"]
+)
+PAGE_BYTES = Counter(
+    "pocket_scraper_page_bytes_total", "Bytes transferred by analyzed pages (Resource Timing)"
+)
+ACCOUNT_ROTATIONS = Counter(
+    "pocket_scraper_account_rotations_total", "Browser account rotations by cause", ["outcome"]
+)
+
+
+_server_started = False
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """Serve /metrics from a daemon thread (once per process)"""
+    global _server_started
+    if not _server_started:
+        start_http_server(port, addr=host)
+        _server_started = True
+        logger.info(f"Metrics available at http://{host}:{port}/metrics")
@@ -0,0 +1,268 @@
+"""
+Pocket - Profile Parsing
+Driver-independent parsing shared by the Selenium and HTTP extraction paths.
+Pure functions over raw HTML or extracted strings, so stored pages can be
+re-processed (and benchmarked) without Chrome or Instagram.
+"""
+
+import re
+import time
+from datetime import datetime
+from html import unescape
+from typing import Any, Dict, Optional
+
+# <meta property="og:title" content="..."> in raw HTML (attributes in any order)
+META_TAG_PATTERN = re.compile(r'<meta\s[^>]*>', re.IGNORECASE)
+META_ATTR_PATTERN = re.compile(r'(property|name|content)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
+# "Full Name (@username) • Instagram photos and videos"
+TITLE_PATTERN = re.compile(r'^(.+?)\s*\(@([^)]+)\)')
+
+# Counts like "664M", "1.2K", "3,932" followed by their label
+NUMBER = r'(\d[\d,]*(?:\.\d+)?[KMB]?)'
+DESCRIPTION_PATTERNS = {
+    'followers': re.compile(NUMBER + r'\s+Followers?'),
+    'following': re.compile(NUMBER + r'\s+Following'),
+    'posts': re.compile(NUMBER + r'\s+Posts?'),
+}
+TEXT_PATTERNS = {
+    'followers': re.compile(NUMBER + r'\s+followers?', re.IGNORECASE),
+    'following': re.compile(NUMBER + r'\s+following', re.IGNORECASE),
+    'posts': re.compile(NUMBER + r'\s+posts?', re.IGNORECASE),
+}
+
+# Embedded JSON fields ("username": "cristiano", "followers": 123)
+JSON_USERNAME_PATTERN = re.compile(r'"username":\s*"([^"]+)"')
+JSON_FULL_NAME_PATTERN = re.compile(r'"full_name":\s*"([^"]+)"')
+JSON_COUNT_PATTERNS = {
+    'followers': re.compile(r'"followers":\s*(\d+)'),
+    'following': re.compile(r'"following":\s*(\d+)'),
+    'posts': re.compile(r'"posts":\s*(\d+)'),
+}
+
+# Raw HTML -> the pieces the Selenium snapshot script collects in the page
+INLINE_SCRIPT_PATTERN = re.compile(r'<script(?![^>]*\ssrc=)[^>]*>(.*?)</script\s*>', re.IGNORECASE | re.DOTALL)
+BODY_PATTERN = re.compile(r'<body\b[^>]*>(.*)', re.IGNORECASE | re.DOTALL)
+INVISIBLE_PATTERN = re.compile(r'<(script|style|noscript|template)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]+>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Post grid: /p/<shortcode>/ or /reel/<shortcode>/ links, "... on March 3, 2024 ..." in image alt text
+POST_HREF_PATTERN = re.compile(r'/(p|reel|tv)/([A-Za-z0-9_-]+)')
+ALT_DATE_PATTERN = re.compile(
+    r'\bon ((?:January|February|March|April|May|June|July|August|September|October|November|December) \d{1,2}, \d{4})'
+)
+OVERLAY_COUNT_PATTERN = re.compile(r'^\s*' + NUMBER + r'\s*$', re.IGNORECASE | re.MULTILINE)
+
+MULTIPLIERS = {'K': 1000, 'M': 1000000, 'B': 1000000000}
+
+# Pages Instagram serves instead of the profile
+LOGIN_TITLE_PATTERN = re.compile(r'^\s*Log\s?in\b.*Instagram', re.IGNORECASE)
+RATE_LIMIT_MARKERS = ('Please wait a few minutes before you try again', 'Try Again Later')
+
+
+def empty_profile_info() -> Dict[str, Any]:
+    """Profile info with every field at its default"""
+    return {
+        'username': '',
+        'full_name': '',
+        'biography': '',
+        'followers': 0,
+        'following': 0,
+        'posts': 0,
+        'is_verified': False,
+        'is_private': False,
+        'profile_pic_url': '',
+        'external_url': ''
+    }
+
+
+def profile_result(profile_info: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap profile info in the analyze_profile result shape"""
+    return {
+        'profile_info': profile_info,
+        'posts': [],
+        'total_posts': 0,
+        'scraped_at': time.time()
+    }
+
+
+def parse_number(number_str: str) -> int:
+    """Parse number string like '664M', '1.2K', '3,932' to integer"""
+    number_str = number_str.strip().upper().replace(',', '')
+    try:
+        multiplier = MULTIPLIERS.get(number_str[-1:])
+        if multiplier:
+            return int(float(number_str[:-1]) * multiplier)
+        return int(float(number_str))
+    except ValueError:
+        return 0
+
+
+def _parse_counts(text: str, patterns: Dict[str, re.Pattern], profile_info: Dict[str, Any]):
+    """Fill followers/following/posts from the first match of each pattern"""
+    for field, pattern in patterns.items():
+        match = pattern.search(text)
+        if match:
+            profile_info[field] = parse_number(match.group(1))
+
+
+def extract_meta_tags(html: str) -> Dict[str, str]:
+    """Collect {property-or-name: content} from the <meta> tags of raw HTML"""
+    meta = {}
+    for tag in META_TAG_PATTERN.findall(html):
+        attrs = {}
+        for name, double_quoted, single_quoted in META_ATTR_PATTERN.findall(tag):
+            attrs[name.lower()] = double_quoted or single_quoted
+        key = attrs.get('property') or attrs.get('name')
+        if key and attrs.get('content') and key not in meta:
+            meta[key] = unescape(attrs['content'])
+    return meta
+
+
+def extract_embedded_json(html: str) -> str:
+    """Inline <script> bodies that mention "username" (where profile JSON lives)"""
+    return '\n'.join(script for script in INLINE_SCRIPT_PATTERN.findall(html) if '"username"' in script)
+
+
+def extract_text(html: str) -> Optional[str]:
+    """Approximate document.body.innerText of raw HTML (None without a <body>)"""
+    body = BODY_PATTERN.search(html)
+    if not body:
+        return None
+    text = INVISIBLE_PATTERN.sub(' ', body.group(1))
+    text = TAG_PATTERN.sub(' ', text)
+    return WHITESPACE_PATTERN.sub(' ', unescape(text)).strip()
+
+
+def parse_meta_tags(meta: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Build profile data from og: meta tags; None when they don't describe a profile"""
+    profile_data = empty_profile_info()
+
+    title = meta.get('og:title')
+    if title:
+        match = TITLE_PATTERN.match(title)
+        if match:
+            profile_data['full_name'] = match.group(1).strip()
+            profile_data['username'] = match.group(2).strip()
+
+    description = meta.get('og:description')
+    if description:
+        profile_data['biography'] = description
+        # Format: "664M Followers, 623 Following, 3,932 Posts - See Instagram photos..."
+        _parse_counts(description, DESCRIPTION_PATTERNS, profile_data)
+
+    image = meta.get('og:image')
+    if image:
+        profile_data['profile_pic_url'] = image
+
+    # Check if we got meaningful data
+    if profile_data['username'] and profile_data['full_name']:
+        return profile_result(profile_data)
+
+    return None
+
+
+def parse_page_text(page_text: str) -> Dict[str, Any]:
+    """Build profile data from the rendered body text"""
+    profile_data = empty_profile_info()
+
+    if "This account is private" in page_text:
+        profile_data['is_private'] = True
+
+    _parse_counts(page_text, TEXT_PATTERNS, profile_data)
+
+    if "Verified" in page_text:
+        profile_data['is_verified'] = True
+
+    return profile_result(profile_data)
+
+
+def parse_embedded_json(source: str) -> Optional[Dict[str, Any]]:
+    """Build profile data from "username": ... fields in embedded JSON; None without a username"""
+    username_match = JSON_USERNAME_PATTERN.search(source)
+    if not username_match:
+        return None
+
+    profile_data = empty_profile_info()
+    profile_data['username'] = username_match.group(1)
+
+    full_name_match = JSON_FULL_NAME_PATTERN.search(source)
+    if full_name_match:
+        profile_data['full_name'] = full_name_match.group(1)
+
+    for field, pattern in JSON_COUNT_PATTERNS.items():
+        match = pattern.search(source)
+        if match:
+            profile_data[field] = int(match.group(1))
+
+    return profile_result(profile_data)
+
+
+def snapshot_from_html(html: str) -> Dict[str, Any]:
+    """The {meta, text, json} snapshot (as collected by the Selenium scraper) of a raw HTML page"""
+    return {
+        'meta': extract_meta_tags(html),
+        'text': extract_text(html),
+        'json': extract_embedded_json(html),
+    }
+
+
+def detect_block(snapshot: Dict[str, Any]) -> Optional[str]:
+    """'login_wall' or 'rate_limited' when the snapshot is a block page rather than a profile"""
+    text = snapshot.get('text') or ''
+    if any(marker in text for marker in RATE_LIMIT_MARKERS):
+        return 'rate_limited'
+    if LOGIN_TITLE_PATTERN.match((snapshot.get('meta') or {}).get('og:title', '')):
+        return 'login_wall'
+    return None
+
+
+def parse_snapshot(snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Run the extraction methods in scraper order: meta tags, page content, embedded JSON"""
+    profile_data = parse_meta_tags(snapshot.get('meta') or {})
+    if profile_data:
+        return profile_data
+    if snapshot.get('text') is not None:
+        return parse_page_text(snapshot['text'])
+    return parse_embedded_json(snapshot.get('json') or '')
+
+
+def parse_profile_html(html: str) -> Optional[Dict[str, Any]]:
+    """Profile data from a raw (e.g. stored) profile page"""
+    return parse_snapshot(snapshot_from_html(html))
+
+
+def parse_grid_item(item: Dict[str, Any], username: str = '') -> Optional[Dict[str, Any]]:
+    """
+    Post data from a profile-grid link ({href, alt, overlay}); None for non-post links.
+    The grid only exposes the view count overlay (reels); likes/comments stay None.
+    """
+    match = POST_HREF_PATTERN.search(item.get('href') or '')
+    if not match:
+        return None
+
+    kind, shortcode = match.groups()
+    alt = item.get('alt') or ''
+
+    posted_at = None
+    date_match = ALT_DATE_PATTERN.search(alt)
+    if date_match:
+        posted_at = datetime.strptime(date_match.group(1), '%B %d, %Y')
+
+    views = None
+    count_match = OVERLAY_COUNT_PATTERN.search(item.get('overlay') or '')
+    if count_match:
+        views = parse_number(count_match.group(1))
+
+    return {
+        'shortcode': shortcode,
+        'url': f"https://www.instagram.com/{kind}/{shortcode}/",
+        'username': username,
+        'is_video': kind in ('reel', 'tv'),
+        'views': views,
+        'likes': None,
+        'comments': None,
+        'posted_at': posted_at,
+        'caption': alt,
+    }
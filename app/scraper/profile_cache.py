@@ -0,0 +1,216 @@
+"""
+Pocket - Profile Result Cache
+TTL cache of analyze_profile results (local disk or Redis) with
+stale-while-revalidate and single-flight fetches per username
+"""
+
+import hashlib
+import json
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from app.config.settings import get_settings
+from .metrics import CACHE_LOOKUPS
+
+try:
+    import redis
+except ImportError:  # Optional: only needed for profile_cache_backend = "redis"
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+Entry = Tuple[Dict[str, Any], float]  # (profile_data, stored_at)
+
+LOOKUP_RESULTS = {'hits': 'hit', 'stale_hits': 'stale', 'misses': 'miss', 'shared': 'shared'}
+
+
+class DiskCacheBackend:
+    """One JSON file per username under cache_dir"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Entry]:
+        try:
+            with open(self._path(key), 'r') as f:
+                entry = json.load(f)
+            return entry['data'], entry['stored_at']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set(self, key: str, data: Dict[str, Any], stored_at: float, expire: int):
+        # Write then rename so concurrent readers never see a partial file
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'key': key, 'data': data, 'stored_at': stored_at}, f)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+class RedisCacheBackend:
+    """JSON values in Redis, expiring once they are too old to serve even stale"""
+
+    def __init__(self, redis_url: str, prefix: str = "pocket:profile:"):
+        if redis is None:
+            raise RuntimeError("redis package is not installed (pip install redis)")
+        self.client = redis.Redis.from_url(redis_url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Entry]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        return entry['data'], entry['stored_at']
+
+    def set(self, key: str, data: Dict[str, Any], stored_at: float, expire: int):
+        self.client.set(self.prefix + key, json.dumps({'data': data, 'stored_at': stored_at}), ex=expire)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+class ProfileCache:
+    """
+    Results younger than `ttl` are served as-is. Results up to `ttl + stale_ttl`
+    old are served immediately while one background refresh replaces them (when
+    the caller supplies a refresh; otherwise they are refetched in the foreground).
+    Concurrent misses for the same username in this process share one fetch.
+    """
+
+    def __init__(self, backend, ttl: int = None, stale_ttl: int = None, refresh_workers: int = 2):
+        settings = get_settings()
+        self.backend = backend
+        self.ttl = ttl if ttl is not None else settings.profile_cache_ttl
+        self.stale_ttl = stale_ttl if stale_ttl is not None else settings.profile_cache_stale_ttl
+        self._inflight: Dict[str, Future] = {}  # foreground fetches, shared by concurrent misses
+        self._refreshing: Set[str] = set()  # background refreshes, never joined by callers
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="profile-cache")
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'shared': 0, 'refresh_errors': 0}
+
+    @staticmethod
+    def key(username: str) -> str:
+        return username.strip().lstrip('@').lower()
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+        if stat in LOOKUP_RESULTS:
+            CACHE_LOOKUPS.labels(result=LOOKUP_RESULTS[stat]).inc()
+
+    def _lookup(self, key: str) -> Optional[Entry]:
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Profile cache read failed for @{key}: {e}")
+            return None
+
+    def _store(self, key: str, data: Dict[str, Any]):
+        try:
+            self.backend.set(key, data, time.time(), self.ttl + self.stale_ttl)
+        except Exception as e:
+            logger.warning(f"Profile cache write failed for @{key}: {e}")
+
+    def _single_flight(self, key: str, fetch: Callable[[], Dict[str, Any]]) -> Tuple[Future, bool]:
+        """Future for the in-flight fetch of key, starting it in this thread if there is none"""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+
+        try:
+            data = fetch()
+            self._store(key, data)
+            future.set_result(data)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future, True
+
+    def _refresh(self, key: str, refresh: Callable[[], Dict[str, Any]]):
+        # Kept apart from _inflight: a foreground miss must not inherit the failure of a
+        # refresh that could not do what the caller's own fetch can (e.g. HTTP-only)
+        try:
+            self._store(key, refresh())
+        except Exception as e:
+            self._count('refresh_errors')
+            logger.warning(f"Background refresh failed for @{key}: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_fetch(self, username: str, fetch: Callable[[], Dict[str, Any]],
+                     refresh: Callable[[], Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Cached result for username, calling fetch() on a miss.
+        refresh revalidates stale entries from a background thread, so it must use
+        resources of its own (never the caller's browser, which may be busy or closed
+        by then); without one, stale entries are refetched in the foreground.
+        """
+        key = self.key(username)
+        entry = self._lookup(key)
+
+        if entry is not None:
+            data, stored_at = entry
+            age = time.time() - stored_at
+            if age < self.ttl:
+                self._count('hits')
+                return data
+            if refresh is not None and age < self.ttl + self.stale_ttl:
+                self._count('stale_hits')
+                with self._lock:
+                    start_refresh = key not in self._refreshing and key not in self._inflight
+                    if start_refresh:
+                        self._refreshing.add(key)
+                if start_refresh:
+                    logger.info(f"Serving stale @{key} ({age:.0f}s old), refreshing in background")
+                    self._refresher.submit(self._refresh, key, refresh)
+                return data
+
+        future, leader = self._single_flight(key, fetch)
+        self._count('misses' if leader else 'shared')
+        return future.result()
+
+    def invalidate(self, username: str):
+        self.backend.delete(self.key(username))
+
+
+_cache: Optional[ProfileCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> Optional[ProfileCache]:
+    """Process-wide cache from settings (None when profile_cache_backend is "none")"""
+    global _cache
+    settings = get_settings()
+    if settings.profile_cache_backend == "none":
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            if settings.profile_cache_backend == "redis":
+                backend = RedisCacheBackend(settings.redis_url)
+            else:
+                backend = DiskCacheBackend(settings.profile_cache_dir)
+            _cache = ProfileCache(backend)
+            logger.info(f"Profile cache: {settings.profile_cache_backend} (ttl {_cache.ttl}s, stale {_cache.stale_ttl}s)")
+        return _cache
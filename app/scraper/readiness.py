@@ -0,0 +1,164 @@
+"""
+Pocket - Page Readiness
+Explicit wait conditions, adaptive timeouts, step timings and anti-bot pacing
+"""
+
+import random
+import time
+import logging
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator
+from app.config.settings import get_settings
+from .metrics import STEP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+# Wait conditions (callables for WebDriverWait.until)
+
+def document_ready(driver) -> bool:
+    """document.readyState is complete"""
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def meta_tag_present(property_name: str) -> Callable:
+    """A <meta property=...> tag with content exists (Instagram renders og: tags once the profile loads)"""
+    script = f"var m = document.querySelector('meta[property=\"{property_name}\"]'); return !!(m && m.content);"
+
+    def condition(driver) -> bool:
+        return bool(driver.execute_script(script))
+    return condition
+
+
+def element_present(css_selector: str) -> Callable:
+    """An element matching css_selector exists"""
+    script = f"return !!document.querySelector('{css_selector}');"
+
+    def condition(driver) -> bool:
+        return bool(driver.execute_script(script))
+    return condition
+
+
+def url_contains(fragment: str) -> Callable:
+    """The current URL contains fragment"""
+    def condition(driver) -> bool:
+        return fragment in driver.current_url
+    return condition
+
+
+def url_changed(previous_url: str) -> Callable:
+    """The current URL differs from previous_url"""
+    def condition(driver) -> bool:
+        return driver.current_url != previous_url
+    return condition
+
+
+def network_idle(quiet_period: float = 0.5) -> Callable:
+    """
+    No new resource entries for quiet_period seconds after the document is complete
+    (Resource Timing API, so no proxy or CDP listener is required)
+    """
+    state = {'count': -1, 'since': 0.0}
+
+    def condition(driver) -> bool:
+        count = driver.execute_script(
+            "return document.readyState === 'complete' ? performance.getEntriesByType('resource').length : -1"
+        )
+        now = time.monotonic()
+        if count < 0 or count != state['count']:
+            state['count'], state['since'] = count, now
+            return False
+        return now - state['since'] >= quiet_period
+    return condition
+
+
+def any_of(*conditions: Callable) -> Callable:
+    """True as soon as one of the conditions is true"""
+    def condition(driver) -> bool:
+        return any(check(driver) for check in conditions)
+    return condition
+
+
+class StepTimer:
+    """Per-step duration samples (navigation, waits, extraction)"""
+
+    def __init__(self, history: int = 200):
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=history))
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time a with-block under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, duration: float):
+        self.samples[name].append(duration)
+        STEP_SECONDS.labels(step=name).observe(duration)
+        logger.debug(f"Step {name}: {duration * 1000:.0f}ms")
+
+    def percentile(self, name: str, pct: float) -> float:
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Count, mean, p95 and max (seconds) per step"""
+        return {
+            name: {
+                'count': len(samples),
+                'mean': sum(samples) / len(samples),
+                'p95': self.percentile(name, 95),
+                'max': max(samples),
+            }
+            for name, samples in self.samples.items() if samples
+        }
+
+
+class AdaptiveTimeout:
+    """
+    Wait timeouts derived from observed step durations: a multiple of the recent
+    p95, clamped to [minimum, maximum]. Steps without history use the maximum.
+    """
+
+    def __init__(self, timer: StepTimer, minimum: float = None, maximum: float = None, multiplier: float = 3.0):
+        settings = get_settings()
+        self.timer = timer
+        self.minimum = minimum if minimum is not None else settings.page_ready_timeout_min
+        self.maximum = maximum if maximum is not None else settings.page_ready_timeout_max
+        self.multiplier = multiplier
+
+    def for_step(self, name: str) -> float:
+        p95 = self.timer.percentile(name, 95)
+        if not p95:
+            return self.maximum
+        return min(self.maximum, max(self.minimum, p95 * self.multiplier))
+
+
+class PacingPolicy:
+    """
+    Randomized human-like pauses, kept separate from readiness so they can be tuned
+    (or disabled) without affecting how long we wait for pages.
+    """
+
+    def __init__(self, enabled: bool = None, action_delay: tuple = None, navigation_delay: tuple = None):
+        settings = get_settings()
+        self.enabled = settings.pacing_enabled if enabled is None else enabled
+        self.action_delay = action_delay or (settings.pacing_action_min, settings.pacing_action_max)
+        self.navigation_delay = navigation_delay or (0.0, float(settings.scraping_delay))
+
+    def _pause(self, bounds: tuple):
+        if self.enabled and bounds[1] > 0:
+            time.sleep(random.uniform(*bounds))
+
+    def action(self):
+        """Pause between UI actions (click, typing)"""
+        self._pause(self.action_delay)
+
+    def navigation(self):
+        """Pause before navigating to a new page"""
+        self._pause(self.navigation_delay)
@@ -0,0 +1,166 @@
+"""
+Pocket - Session Pool
+Several Instagram accounts, each with its own session file, health state and
+cooldown, leased to browser workers round-robin or least-recently-used
+"""
+
+import json
+import os
+import re
+import time
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPoolExhausted(Exception):
+    """No account became available within the lease timeout"""
+
+
+class RateLimitedError(Exception):
+    """Instagram asked the account to slow down ("Please wait a few minutes")"""
+
+
+@dataclass
+class Account:
+    """One Instagram login and its rotation state"""
+    username: str
+    password: str
+    session_file: str
+    failures: int = 0
+    cooldown_until: float = 0.0
+    last_used: float = 0.0
+    leased: bool = False
+    stats: Dict[str, int] = field(default_factory=lambda: {'leases': 0, 'login_walls': 0, 'rate_limits': 0, 'errors': 0})
+
+    @property
+    def cooling_down(self) -> bool:
+        return time.time() < self.cooldown_until
+
+
+def session_file_for(username: str, session_dir: str = "sessions") -> str:
+    """Per-account session file (sessions/instagram_<username>.json)"""
+    safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', username)
+    return os.path.join(session_dir, f"instagram_{safe_name}.json")
+
+
+def load_accounts() -> List[Account]:
+    """
+    Accounts from settings.instagram_accounts_file (JSON list of {username, password}),
+    else the single instagram_username/instagram_password pair with the legacy session file
+    """
+    settings = get_settings()
+    if settings.instagram_accounts_file:
+        with open(settings.instagram_accounts_file, 'r') as f:
+            entries = json.load(f)
+        return [
+            Account(entry['username'], entry['password'], entry.get('session_file') or session_file_for(entry['username']))
+            for entry in entries
+        ]
+
+    if settings.instagram_username:
+        return [Account(settings.instagram_username, settings.instagram_password, "sessions/instagram_session.json")]
+    return []
+
+
+class SessionPool:
+    """
+    Exclusive leases on accounts. Accounts that hit a login wall, rate limit or
+    repeated errors cool down for account_cooldown_seconds * 2^(failures - 1),
+    capped at account_cooldown_max_seconds; a clean run resets them.
+    """
+
+    def __init__(self, accounts: List[Account] = None, strategy: str = None):
+        settings = get_settings()
+        self.accounts = accounts if accounts is not None else load_accounts()
+        if not self.accounts:
+            raise ValueError("No Instagram accounts configured")
+        self.strategy = strategy or settings.session_pool_strategy
+        if self.strategy not in ('round_robin', 'lru'):
+            raise ValueError(f"Unknown session pool strategy: {self.strategy}")
+        self.cooldown = settings.account_cooldown_seconds
+        self.cooldown_max = settings.account_cooldown_max_seconds
+        self._next = 0
+        self._condition = threading.Condition()
+
+    def _available(self) -> List[Account]:
+        return [account for account in self.accounts if not account.leased and not account.cooling_down]
+
+    def _pick(self) -> Optional[Account]:
+        available = self._available()
+        if not available:
+            return None
+        if self.strategy == 'lru':
+            return min(available, key=lambda account: account.last_used)
+
+        # Round-robin: first available account at or after the cursor
+        for offset in range(len(self.accounts)):
+            account = self.accounts[(self._next + offset) % len(self.accounts)]
+            if account in available:
+                self._next = (self._next + offset + 1) % len(self.accounts)
+                return account
+        return None
+
+    def acquire(self, timeout: float = None) -> Account:
+        """Lease an account, waiting for a release or a cooldown to end"""
+        timeout = timeout if timeout is not None else get_settings().browser_checkout_timeout
+        deadline = time.monotonic() + timeout
+
+        with self._condition:
+            while True:
+                account = self._pick()
+                if account:
+                    account.leased = True
+                    account.last_used = time.time()
+                    account.stats['leases'] += 1
+                    logger.info(f"Leased Instagram account {account.username}")
+                    return account
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SessionPoolExhausted(f"No Instagram account available after {timeout}s")
+                # Wake up for releases, or when the earliest cooldown ends
+                cooldowns = [account.cooldown_until - time.time() for account in self.accounts
+                             if account.cooling_down and not account.leased]
+                self._condition.wait(min([remaining] + [max(0.1, wait) for wait in cooldowns]))
+
+    def release(self, account: Account, outcome: str = 'ok'):
+        """
+        Return a lease. outcome is 'ok', 'login_wall', 'rate_limited' or 'error';
+        anything but 'ok' counts as a failure and starts a cooldown.
+        """
+        with self._condition:
+            account.leased = False
+            account.last_used = time.time()
+            if outcome == 'ok':
+                account.failures = 0
+            else:
+                account.failures += 1
+                stat = {'login_wall': 'login_walls', 'rate_limited': 'rate_limits'}.get(outcome, 'errors')
+                account.stats[stat] += 1
+                cooldown = min(self.cooldown_max, self.cooldown * 2 ** (account.failures - 1))
+                account.cooldown_until = time.time() + cooldown
+                logger.warning(f"Account {account.username} cooling down {cooldown:.0f}s after {outcome}")
+            self._condition.notify_all()
+
+    def rotate(self, account: Account, outcome: str, timeout: float = None) -> Account:
+        """Release a failing account and lease another one"""
+        self.release(account, outcome)
+        return self.acquire(timeout)
+
+    def status(self) -> List[Dict]:
+        now = time.time()
+        return [
+            {
+                'username': account.username,
+                'leased': account.leased,
+                'cooldown_remaining': max(0.0, account.cooldown_until - now),
+                'failures': account.failures,
+                **account.stats,
+            }
+            for account in self.accounts
+        ]
@@ -0,0 +1,125 @@
+"""
+Pocket - Browser Startup
+Cached chromedriver resolution and persistent Chrome profile directories
+"""
+
+import os
+import logging
+import socket
+import threading
+from typing import Optional, Set
+from app.config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+_driver_path: Optional[str] = None
+_driver_lock = threading.Lock()
+
+_claimed_profiles: Set[str] = set()
+_profiles_lock = threading.Lock()
+
+
+def resolve_chromedriver_path() -> str:
+    """
+    Path to chromedriver, resolved once: settings.chromedriver_path, then the path
+    cached on disk by an earlier run, then webdriver-manager (version check/download)
+    """
+    global _driver_path
+    with _driver_lock:
+        if _driver_path and os.path.exists(_driver_path):
+            return _driver_path
+
+        settings = get_settings()
+        if settings.chromedriver_path:
+            _driver_path = settings.chromedriver_path
+            return _driver_path
+
+        cache_file = settings.chromedriver_cache_file
+        try:
+            with open(cache_file, 'r') as f:
+                cached_path = f.read().strip()
+            if cached_path and os.access(cached_path, os.X_OK):
+                _driver_path = cached_path
+                logger.info(f"Using cached chromedriver: {cached_path}")
+                return _driver_path
+        except OSError:
+            pass
+
+        from webdriver_manager.chrome import ChromeDriverManager
+        _driver_path = ChromeDriverManager().install()
+        try:
+            os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+            with open(cache_file, 'w') as f:
+                f.write(_driver_path)
+        except OSError as e:
+            logger.warning(f"Could not cache chromedriver path: {e}")
+        logger.info(f"Resolved chromedriver: {_driver_path}")
+        return _driver_path
+
+
+def forget_chromedriver_path():
+    """Drop the cached path (e.g. after Chrome was upgraded and the driver no longer matches)"""
+    global _driver_path
+    with _driver_lock:
+        _driver_path = None
+        try:
+            os.remove(get_settings().chromedriver_cache_file)
+        except OSError:
+            pass
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by another user
+    return True
+
+
+def _profile_in_use(path: str) -> bool:
+    """
+    Whether Chrome's SingletonLock (a symlink to "<hostname>-<pid>") marks the profile
+    as in use. Chrome leaves the lock behind after a crash or SIGKILL, so a lock of
+    this host whose process is gone is removed and the profile reused.
+    """
+    lock = os.path.join(path, 'SingletonLock')
+    if not os.path.lexists(lock):
+        return False
+    try:
+        host, _, pid = os.readlink(lock).rpartition('-')
+    except OSError:
+        return True  # not a symlink: can't tell, assume in use
+    if host != socket.gethostname() or not pid.isdigit() or _pid_alive(int(pid)):
+        return True
+
+    logger.info(f"Removing stale Chrome lock of dead process {pid} in {path}")
+    for name in ('SingletonLock', 'SingletonCookie', 'SingletonSocket'):
+        try:
+            os.remove(os.path.join(path, name))
+        except OSError:
+            pass
+    return False
+
+
+def claim_profile_dir(base_dir: str) -> str:
+    """
+    A user-data-dir under base_dir not used by another browser. Chrome allows one
+    instance per profile, so pooled browsers get profile-0, profile-1, ... and keep
+    the same slot (and its cookies) across restarts.
+    """
+    with _profiles_lock:
+        slot = 0
+        while True:
+            path = os.path.abspath(os.path.join(base_dir, f"profile-{slot}"))
+            if path not in _claimed_profiles and not _profile_in_use(path):
+                _claimed_profiles.add(path)
+                os.makedirs(path, exist_ok=True)
+                return path
+            slot += 1
+
+
+def release_profile_dir(path: str):
+    with _profiles_lock:
+        _claimed_profiles.discard(path)
@@ -14,10 +14,98 @@ class Settings:
     
     # Database Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./instagram_analytics.db")
+    # Optional override; derived from DATABASE_URL (aiosqlite/asyncpg) when empty
+    ASYNC_DATABASE_URL: str = os.getenv("ASYNC_DATABASE_URL", "")
+    
+    # Database engine tuning (SQLite pragmas applied on every new connection)
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    
+    # Database engine tuning (connection pool, PostgreSQL and other server databases)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # seconds
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))  # seconds
+    DB_POOL_PRE_PING: bool = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    
+    # Monthly range partitioning of videos by posted_at (PostgreSQL only)
+    DB_PARTITIONING: bool = os.getenv("DB_PARTITIONING", "false").lower() == "true"
+    PARTITION_PRECREATE_MONTHS: int = int(os.getenv("PARTITION_PRECREATE_MONTHS", "3"))
+    PARTITION_BACKFILL_MONTHS: int = int(os.getenv("PARTITION_BACKFILL_MONTHS", "24"))
+    PARTITION_RETENTION_MONTHS: int = int(os.getenv("PARTITION_RETENTION_MONTHS", "0"))  # 0 keeps everything
+    PARTITION_ARCHIVE_SCHEMA: str = os.getenv("PARTITION_ARCHIVE_SCHEMA", "archive")
+    PARTITION_LOCK_TIMEOUT: str = os.getenv("PARTITION_LOCK_TIMEOUT", "5s")
+    
+    # JSON list responses (pages with at least this many items are streamed; 0 disables)
+    JSON_STREAM_MIN_ITEMS: int = int(os.getenv("JSON_STREAM_MIN_ITEMS", "500"))
+    JSON_STREAM_CHUNK_SIZE: int = int(os.getenv("JSON_STREAM_CHUNK_SIZE", "200"))
+    
+    # Large columns left out of list responses unless requested with ?fields=
+    LIST_DEFERRED_FIELDS: list = ["transcription"]
+    
+    # Request profiling (off by default; the middleware is not installed unless enabled)
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0.0"))  # fraction of requests
+    # Requests with `X-Profile: <token>` are always profiled; /admin/profiles requires the token
+    # in X-Profile-Token and is closed while it is empty
+    PROFILING_TOKEN: str = os.getenv("PROFILING_TOKEN", "")
+    PROFILING_CPROFILE: bool = os.getenv("PROFILING_CPROFILE", "true").lower() == "true"
+    PROFILING_MAX_PROFILES: int = int(os.getenv("PROFILING_MAX_PROFILES", "50"))
+    
+    # SQL instrumentation (per-request query counts, slow statements, N+1 detection)
+    SQL_INSTRUMENTATION: bool = os.getenv("SQL_INSTRUMENTATION", "false").lower() == "true"
+    SQL_SLOW_QUERY_MS: float = float(os.getenv("SQL_SLOW_QUERY_MS", "100"))
+    SQL_SLOWEST_KEPT: int = int(os.getenv("SQL_SLOWEST_KEPT", "5"))
+    # Identical statements repeated this many times in one request are reported as N+1
+    SQL_REPEAT_THRESHOLD: int = int(os.getenv("SQL_REPEAT_THRESHOLD", "5"))
+    SQL_EXPLAIN_MS: float = float(os.getenv("SQL_EXPLAIN_MS", "0"))  # EXPLAIN statements slower than this; 0 disables
+    
+    # Transcription (whisper/torch are imported on first use, not at API startup)
+    WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")
+    WHISPER_LANGUAGE: str = os.getenv("WHISPER_LANGUAGE", "pt")
+    # local: each worker loads its own model on first use
+    # preload: gunicorn (gunicorn.conf.py) loads it before forking, shared copy-on-write
+    # ipc: workers call one transcription_server.py process over a Unix socket
+    TRANSCRIPTION_MODE: str = os.getenv("TRANSCRIPTION_MODE", "local")
+    TRANSCRIPTION_SOCKET: str = os.getenv("TRANSCRIPTION_SOCKET", "/tmp/pocket-transcription.sock")
+    TRANSCRIPTION_TIMEOUT: int = int(os.getenv("TRANSCRIPTION_TIMEOUT", "900"))  # seconds
+    
+    # Admission control for POST /videos/scrape (429 when the queue is full, 503 after the timeout)
+    SCRAPE_MAX_CONCURRENT: int = int(os.getenv("SCRAPE_MAX_CONCURRENT", "4"))  # 0 disables
+    SCRAPE_MAX_QUEUE: int = int(os.getenv("SCRAPE_MAX_QUEUE", "8"))
+    SCRAPE_QUEUE_TIMEOUT: float = float(os.getenv("SCRAPE_QUEUE_TIMEOUT", "30"))  # seconds
+    # Stage limits inside admitted scrapes (per worker process)
+    TRANSCRIBE_MAX_CONCURRENT: int = int(os.getenv("TRANSCRIBE_MAX_CONCURRENT", "1"))  # ffmpeg + Whisper, CPU-bound
+    APIFY_MAX_CONCURRENT: int = int(os.getenv("APIFY_MAX_CONCURRENT", "4"))  # Apify runs, I/O-bound
     
     # Apify Configuration
     APIFY_TOKEN: str = os.getenv("APIFY_TOKEN", "YOUR_APIFY_TOKEN_HERE")
     APIFY_ACTOR_ID: str = "apify~instagram-scraper"
+    APIFY_API_URL: str = os.getenv("APIFY_API_URL", "https://api.apify.com/v2")
+    # Token bucket shared by all Apify calls (across workers when REDIS_URL is set; 0 disables)
+    APIFY_RATE_PER_SECOND: float = float(os.getenv("APIFY_RATE_PER_SECOND", "5"))
+    APIFY_RATE_BURST: int = int(os.getenv("APIFY_RATE_BURST", "10"))
+    
+    # Outbound HTTP retries (timeouts, connection errors, 429 and 5xx); same variables as the scraper
+    MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
+    SCRAPING_DELAY: float = float(os.getenv("SCRAPING_DELAY", "2"))  # first Apify run status poll interval
+    RETRY_BACKOFF_BASE: float = float(os.getenv("RETRY_BACKOFF_BASE", "1"))  # seconds, doubled per attempt
+    RETRY_BACKOFF_MAX: float = float(os.getenv("RETRY_BACKOFF_MAX", "30"))
+    OUTBOUND_TIMEOUT: float = float(os.getenv("OUTBOUND_TIMEOUT", "30"))
+    
+    # Apify run completion: webhook callback (public URL of POST {API_V1_STR}/apify/webhook) with
+    # status polling backing off from SCRAPING_DELAY to APIFY_POLL_MAX_INTERVAL. The webhook is
+    # only registered and its endpoint only mounted when both the URL and its own secret are set
+    APIFY_WEBHOOK_URL: str = os.getenv("APIFY_WEBHOOK_URL", "")
+    APIFY_WEBHOOK_SECRET: str = os.getenv("APIFY_WEBHOOK_SECRET", "")
+    APIFY_POLL_MAX_INTERVAL: float = float(os.getenv("APIFY_POLL_MAX_INTERVAL", "15"))
+    APIFY_RUN_TIMEOUT: float = float(os.getenv("APIFY_RUN_TIMEOUT", "120"))  # seconds
+    
+    # Redis (optional; shares rate limits and webhook results between workers)
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
     
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
@@ -1,10 +1,24 @@
 """
 FastAPI application for Instagram Analytics
 """
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from app.config import settings
-from app.routers import videos, profiles, analytics
+from app.routers import videos, profiles, analytics, admin, apify
+from app.services.apify import webhook_enabled
+from app.utils import metrics
+from app.utils.database import async_engine, engine
+from app.utils.profiling import ProfilingMiddleware, instrument_engine
+from app.utils.query_stats import QueryStatsMiddleware
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown (partition maintenance runs from manage_partitions.py, not here)"""
+    yield
+    await async_engine.dispose()
 
 # Create FastAPI app
 app = FastAPI(
@@ -12,6 +26,7 @@ app = FastAPI(
     version=settings.VERSION,
     description="Instagram Analytics Platform - Backend API",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -23,10 +38,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def _route_template(request: Request) -> str:
+    """Path template of the matched route (e.g. /api/v1/videos/{video_id})"""
+    route = request.scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Recent FastAPI versions keep included routes relative to their router's prefix and put the
+    # full template in the effective route context; older versions give it in route.path
+    context = request.scope.get("fastapi", {}).get("effective_route_context")
+    return getattr(context, "path", None) or route.path
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """Request latency by route template (not raw path, to keep label cardinality bounded)"""
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        metrics.HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=_route_template(request),
+            status=str(status),
+        ).observe(time.perf_counter() - start)
+
+# Per-request SQL statistics (engines are instrumented in app.utils.database)
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Opt-in request profiling; when disabled nothing is installed on the request path
+if settings.PROFILING_ENABLED:
+    instrument_engine(engine)
+    instrument_engine(async_engine.sync_engine)
+    app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(videos.router, prefix=f"{settings.API_V1_STR}/videos", tags=["videos"])
 app.include_router(profiles.router, prefix=f"{settings.API_V1_STR}/profiles", tags=["profiles"])
 app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["analytics"])
+if webhook_enabled():
+    app.include_router(apify.router, prefix=f"{settings.API_V1_STR}/apify", tags=["apify"])
+if settings.PROFILING_ENABLED:
+    app.include_router(admin.router, prefix="/admin", tags=["admin"], include_in_schema=False)
 
 @app.get("/")
 async def root():
@@ -37,6 +92,11 @@ async def root():
         "docs": "/docs"
     }
 
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Prometheus metrics of this worker process"""
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
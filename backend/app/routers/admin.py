@@ -0,0 +1,59 @@
+"""
+Admin router for request profiles (mounted only when PROFILING_ENABLED)
+"""
+import secrets
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse, Response
+from typing import Optional
+from app.config import settings
+from app.utils.profiling import STORE, render_stats
+
+SORT_KEYS = ["cumulative", "tottime", "calls", "ncalls", "time"]
+
+def require_token(x_profile_token: Optional[str] = Header(None)):
+    """Profiles expose code paths and timings; closed unless PROFILING_TOKEN is set and matches"""
+    if not settings.PROFILING_TOKEN:
+        raise HTTPException(status_code=403, detail="PROFILING_TOKEN is not configured")
+    if not secrets.compare_digest(x_profile_token or "", settings.PROFILING_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+router = APIRouter(dependencies=[Depends(require_token)])
+
+@router.get("/profiles")
+async def list_profiles():
+    """Recent profiled requests, newest first"""
+    return {"profiles": [profile.summary() for profile in STORE.list()]}
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(
+    profile_id: int,
+    format: str = Query("summary", pattern="^(summary|text|pstats)$"),
+    sort: str = Query("cumulative"),
+    limit: int = Query(60, ge=1, le=1000),
+):
+    """
+    One profile: `summary` (timings), `text` (cProfile report) or `pstats`
+    (binary stats for snakeviz, flameprof or gprof2dot)
+    """
+    profile = STORE.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "summary":
+        return profile.summary()
+    if profile.stats is None:
+        raise HTTPException(status_code=404, detail="No cProfile capture for this request")
+    if format == "pstats":
+        return Response(
+            profile.stats,
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": f'attachment; filename="request-{profile_id}.prof"'},
+        )
+    if sort not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {SORT_KEYS}")
+    return PlainTextResponse(render_stats(profile, sort, limit))
+
+@router.delete("/profiles")
+async def clear_profiles():
+    """Drop all stored profiles"""
+    STORE.clear()
+    return {"message": "Profiles cleared"}
@@ -2,19 +2,63 @@
 Analytics router for API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
 from typing import List, Optional
+from datetime import datetime, timedelta
 from app.utils.database import get_db
+from app.utils.fieldsets import fields_query, parse_fields
 from app.models.video import Video
 from app.models.profile import Profile
 
 router = APIRouter()
 
+# Columns read by the per-video analytics items (never the transcription text)
+ENGAGEMENT_COLUMNS = {
+    column.key: column
+    for column in (Video.id, Video.url, Video.username, Video.likes_rate, Video.comments_rate)
+}
+# Item fields computed in Python and the columns they are derived from
+DERIVED_FIELDS = {
+    "total_engagement_rate": ("likes_rate", "comments_rate"),
+    "is_high_performer": ("likes_rate", "comments_rate"),
+}
+RECENT_VIDEO_COLUMNS = (
+    Video.id, Video.url, Video.likes, Video.comments, Video.views,
+    Video.likes_rate, Video.comments_rate, Video.posted_at
+)
+
+TOP_PERFORMER_FIELDS = ["id", "url", "username", "likes_rate", "comments_rate", "total_engagement_rate"]
+OUTLIER_FIELDS = ["id", "url", "username", "likes_rate", "comments_rate", "is_high_performer"]
+RECENT_VIDEO_FIELDS = [column.key for column in RECENT_VIDEO_COLUMNS]
+
+def _recent(days: Optional[int]):
+    """
+    Filter for videos posted in the last `days` days. A range on posted_at lets
+    PostgreSQL prune partitions outside the window when DB_PARTITIONING is on.
+    """
+    if days is None:
+        return []
+    return [Video.posted_at >= datetime.now() - timedelta(days=days)]
+
+def _engagement_columns(selected: List[str]) -> list:
+    """Columns backing the selected engagement item fields (derived fields pull in their inputs)"""
+    needed = set(selected)
+    for name in selected:
+        needed.update(DERIVED_FIELDS.get(name, ()))
+    return [column for key, column in ENGAGEMENT_COLUMNS.items() if key in needed]
+
+def _engagement_item(video, selected: List[str]) -> dict:
+    """Selected plain column values of an engagement row"""
+    return {name: getattr(video, name) for name in selected if name in ENGAGEMENT_COLUMNS}
+
 @router.get("/engagement-stats")
-async def get_engagement_stats(db: Session = Depends(get_db)):
+async def get_engagement_stats(
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    db: AsyncSession = Depends(get_db)
+):
     """Get overall engagement statistics"""
-    stats = db.query(
+    result = await db.execute(select(
         func.avg(Video.likes_rate).label('avg_likes_rate'),
         func.avg(Video.comments_rate).label('avg_comments_rate'),
         func.max(Video.likes_rate).label('max_likes_rate'),
@@ -22,7 +66,8 @@ async def get_engagement_stats(db: Session = Depends(get_db)):
         func.min(Video.likes_rate).label('min_likes_rate'),
         func.min(Video.comments_rate).label('min_comments_rate'),
         func.count(Video.id).label('total_videos')
-    ).first()
+    ).filter(*_recent(days)))
+    stats = result.first()
     
     return {
         "average_likes_rate": round(stats.avg_likes_rate or 0, 2),
@@ -37,36 +82,41 @@ async def get_engagement_stats(db: Session = Depends(get_db)):
 @router.get("/top-performers")
 async def get_top_performers(
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get top performing videos by engagement rate"""
-    videos = db.query(Video).order_by(
+    selected = parse_fields(fields, TOP_PERFORMER_FIELDS)
+    result = await db.execute(select(*_engagement_columns(selected)).filter(*_recent(days)).order_by(
         (Video.likes_rate + Video.comments_rate).desc()
-    ).limit(limit).all()
+    ).limit(limit))
+    videos = result.all()
     
-    return [
-        {
-            "id": video.id,
-            "url": video.url,
-            "username": video.username,
-            "likes_rate": video.likes_rate,
-            "comments_rate": video.comments_rate,
-            "total_engagement_rate": round(video.likes_rate + video.comments_rate, 2)
-        }
-        for video in videos
-    ]
+    items = []
+    for video in videos:
+        item = _engagement_item(video, selected)
+        if "total_engagement_rate" in selected:
+            item["total_engagement_rate"] = round(video.likes_rate + video.comments_rate, 2)
+        items.append(item)
+    return items
 
 @router.get("/outliers")
 async def get_outliers(
     threshold: float = Query(2.0, ge=0.1, le=10.0),
-    db: Session = Depends(get_db)
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get outlier videos (engagement rate significantly above/below average)"""
+    selected = parse_fields(fields, OUTLIER_FIELDS)
+    
     # Get average engagement rates
-    avg_stats = db.query(
+    result = await db.execute(select(
         func.avg(Video.likes_rate).label('avg_likes_rate'),
         func.avg(Video.comments_rate).label('avg_comments_rate')
-    ).first()
+    ).filter(*_recent(days)))
+    avg_stats = result.first()
     
     avg_likes_rate = avg_stats.avg_likes_rate or 0
     avg_comments_rate = avg_stats.avg_comments_rate or 0
@@ -78,41 +128,48 @@ async def get_outliers(
     comments_threshold_low = avg_comments_rate * (1 - threshold)
     
     # Find outliers
-    outliers = db.query(Video).filter(
+    result = await db.execute(select(*_engagement_columns(selected)).filter(*_recent(days)).filter(
         (Video.likes_rate > likes_threshold_high) |
         (Video.likes_rate < likes_threshold_low) |
         (Video.comments_rate > comments_threshold_high) |
         (Video.comments_rate < comments_threshold_low)
-    ).all()
+    ))
+    outliers = result.all()
+    
+    items = []
+    for video in outliers:
+        item = _engagement_item(video, selected)
+        if "is_high_performer" in selected:
+            item["is_high_performer"] = (
+                video.likes_rate > likes_threshold_high or 
+                video.comments_rate > comments_threshold_high
+            )
+        items.append(item)
     
     return {
         "average_likes_rate": round(avg_likes_rate, 2),
         "average_comments_rate": round(avg_comments_rate, 2),
         "threshold_multiplier": threshold,
-        "outliers": [
-            {
-                "id": video.id,
-                "url": video.url,
-                "username": video.username,
-                "likes_rate": video.likes_rate,
-                "comments_rate": video.comments_rate,
-                "is_high_performer": (
-                    video.likes_rate > likes_threshold_high or 
-                    video.comments_rate > comments_threshold_high
-                )
-            }
-            for video in outliers
-        ]
+        "outliers": items
     }
 
 @router.get("/profile-stats/{username}")
-async def get_profile_stats(username: str, db: Session = Depends(get_db)):
-    """Get statistics for a specific profile"""
-    profile = db.query(Profile).filter(Profile.username == username).first()
+async def get_profile_stats(
+    username: str,
+    days: Optional[int] = Query(None, ge=1, le=3650),
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get statistics for a specific profile (`fields` applies to recent_videos)"""
+    selected = parse_fields(fields, RECENT_VIDEO_FIELDS)
+    result = await db.execute(select(Profile).filter(Profile.username == username))
+    profile = result.scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    videos = db.query(Video).filter(Video.username == username).all()
+    columns = [column for column in RECENT_VIDEO_COLUMNS if column.key in selected]
+    result = await db.execute(select(*columns).filter(Video.username == username, *_recent(days)))
+    videos = result.all()
     
     return {
         "profile": {
@@ -126,16 +183,7 @@ async def get_profile_stats(username: str, db: Session = Depends(get_db)):
             "avg_comments_rate": profile.avg_comments_rate
         },
         "recent_videos": [
-            {
-                "id": video.id,
-                "url": video.url,
-                "likes": video.likes,
-                "comments": video.comments,
-                "views": video.views,
-                "likes_rate": video.likes_rate,
-                "comments_rate": video.comments_rate,
-                "posted_at": video.posted_at
-            }
+            video._asdict()
             for video in videos[-10:]  # Last 10 videos
         ]
     }
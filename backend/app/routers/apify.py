@@ -0,0 +1,38 @@
+"""
+Apify webhook router (run completion callbacks)
+"""
+import secrets
+from fastapi import APIRouter, Body, HTTPException, Query
+from typing import Any, Dict
+from app.config import settings
+from app.services.apify import TERMINAL_STATUSES, pending_runs, webhook_enabled
+
+router = APIRouter()
+
+# Event types of the webhooks registered by start_run, mapped to run statuses
+EVENT_STATUSES = {
+    "ACTOR.RUN.SUCCEEDED": "SUCCEEDED",
+    "ACTOR.RUN.FAILED": "FAILED",
+    "ACTOR.RUN.TIMED_OUT": "TIMED-OUT",
+    "ACTOR.RUN.ABORTED": "ABORTED",
+}
+
+@router.post("/webhook", include_in_schema=False)
+def apify_webhook(
+    token: str = Query(...),
+    payload: Dict[str, Any] = Body(...),
+):
+    """Resolve the pending scrape waiting on a finished Apify run (sync: publishing to Redis blocks)"""
+    if not webhook_enabled():
+        raise HTTPException(status_code=404, detail="Webhooks are not enabled")
+    if not secrets.compare_digest(token, settings.APIFY_WEBHOOK_SECRET):
+        raise HTTPException(status_code=403, detail="Invalid webhook token")
+    
+    resource = payload.get("resource") or {}
+    run_id = resource.get("id") or (payload.get("eventData") or {}).get("actorRunId")
+    status = resource.get("status") or EVENT_STATUSES.get(payload.get("eventType"))
+    if not run_id or status not in TERMINAL_STATUSES:
+        raise HTTPException(status_code=400, detail="Payload has no finished run")
+    
+    matched = pending_runs.resolve(run_id, status)
+    return {"run_id": run_id, "status": status, "matched": matched}
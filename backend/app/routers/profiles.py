@@ -2,73 +2,141 @@
 Profile router for API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from typing import List, Optional
+from app.config import settings
 from app.utils.database import get_db
+from app.utils.fieldsets import fields_query, parse_fields
+from app.utils.serialization import (
+    ORJSONResponse, list_response, schema_columns, should_stream, stream_list_response, stream_rows
+)
 from app.models.profile import Profile
+from app.models.video import Video
+from app.schemas.video import Video as VideoSchema
 from app.schemas.profile import ProfileCreate, ProfileUpdate, Profile as ProfileSchema, ProfileList
 
 router = APIRouter()
 
+# Fields of the Profile/Video response schemas; large video fields are deferred on list endpoints
+PROFILE_FIELDS = list(ProfileSchema.model_fields)
+VIDEO_FIELDS = list(VideoSchema.model_fields)
+VIDEO_LIST_FIELDS = [name for name in VIDEO_FIELDS if name not in settings.LIST_DEFERRED_FIELDS]
+
+def _profile_statement(fields: List[str]):
+    """Column-restricted profile SELECT (`videos` is loaded separately)"""
+    return select(*schema_columns(ProfileSchema, Profile.__table__, fields))
+
+def _videos_loader(video_fields: List[str]):
+    """Build a loader filling the nested `videos` list of each profile row with one query"""
+    columns = schema_columns(VideoSchema, Video.__table__, video_fields)
+    
+    async def attach_videos(db: AsyncSession, profiles: List[dict]):
+        videos_by_profile = {}
+        for profile in profiles:
+            profile["videos"] = videos_by_profile.setdefault(profile["id"], [])
+        if not videos_by_profile:
+            return
+        
+        result = await db.execute(
+            select(Video.profile_id.label("_profile_id"), *columns).filter(Video.profile_id.in_(videos_by_profile))
+        )
+        for row in result.mappings():
+            video = dict(row)
+            videos_by_profile[video.pop("_profile_id")].append(video)
+    
+    return attach_videos
+
+async def _get_profile_row(db: AsyncSession, fields: Optional[str], *criteria):
+    """Load a single profile as a plain dict restricted to the requested fields"""
+    selected = parse_fields(fields, PROFILE_FIELDS)
+    result = await db.execute(_profile_statement(selected).filter(*criteria))
+    row = result.mappings().first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    
+    profile = dict(row)
+    if "videos" in selected:
+        await _videos_loader(VIDEO_FIELDS)(db, [profile])
+    return profile
+
+async def _get_profile(db: AsyncSession, *criteria):
+    """Load a single profile with its videos eagerly (no lazy loads under asyncio)"""
+    result = await db.execute(
+        select(Profile)
+        .options(selectinload(Profile.videos))
+        .filter(*criteria)
+        .execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
+
 @router.get("/", response_model=ProfileList)
 async def get_profiles(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all profiles with pagination"""
-    profiles = db.query(Profile).offset(skip).limit(limit).all()
-    total = db.query(Profile).count()
+    """Get all profiles with pagination (nested videos without transcription)"""
+    selected = parse_fields(fields, PROFILE_FIELDS)
+    statement = _profile_statement(selected).order_by(Profile.id).offset(skip).limit(limit)
+    attach_videos = _videos_loader(VIDEO_LIST_FIELDS) if "videos" in selected else None
+    total = await db.scalar(select(func.count()).select_from(Profile))
+    page = skip // limit + 1
     
-    return ProfileList(
-        profiles=profiles,
-        total=total,
-        page=skip // limit + 1,
-        size=limit
-    )
+    if should_stream(limit):
+        return stream_list_response("profiles", stream_rows(statement, enrich=attach_videos), total, page, limit)
+    
+    result = await db.execute(statement)
+    profiles = [dict(row) for row in result.mappings()]
+    if attach_videos:
+        await attach_videos(db, profiles)
+    return list_response("profiles", profiles, total, page, limit)
 
 @router.get("/{profile_id}", response_model=ProfileSchema)
-async def get_profile(profile_id: int, db: Session = Depends(get_db)):
+async def get_profile(
+    profile_id: int,
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
+):
     """Get profile by ID"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    return profile
+    return ORJSONResponse(await _get_profile_row(db, fields, Profile.id == profile_id))
 
 @router.get("/username/{username}", response_model=ProfileSchema)
-async def get_profile_by_username(username: str, db: Session = Depends(get_db)):
+async def get_profile_by_username(
+    username: str,
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
+):
     """Get profile by username"""
-    profile = db.query(Profile).filter(Profile.username == username).first()
-    if not profile:
-        raise HTTPException(status_code=404, detail="Profile not found")
-    return profile
+    return ORJSONResponse(await _get_profile_row(db, fields, Profile.username == username))
 
 @router.post("/", response_model=ProfileSchema)
 async def create_profile(
     profile_data: ProfileCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Create new profile"""
     # Check if profile already exists
-    existing_profile = db.query(Profile).filter(Profile.username == profile_data.username).first()
+    existing_profile = await db.scalar(select(Profile.id).filter(Profile.username == profile_data.username))
     if existing_profile:
         raise HTTPException(status_code=400, detail="Profile already exists")
     
     db_profile = Profile(**profile_data.dict())
     db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
+    await db.commit()
     
-    return db_profile
+    return await _get_profile(db, Profile.id == db_profile.id)
 
 @router.put("/{profile_id}", response_model=ProfileSchema)
 async def update_profile(
     profile_id: int,
     profile_update: ProfileUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update profile data"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    profile = await _get_profile(db, Profile.id == profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
@@ -76,17 +144,16 @@ async def update_profile(
     for key, value in update_data.items():
         setattr(profile, key, value)
     
-    db.commit()
-    db.refresh(profile)
-    return profile
+    await db.commit()
+    return await _get_profile(db, Profile.id == profile_id)
 
 @router.delete("/{profile_id}")
-async def delete_profile(profile_id: int, db: Session = Depends(get_db)):
+async def delete_profile(profile_id: int, db: AsyncSession = Depends(get_db)):
     """Delete profile"""
-    profile = db.query(Profile).filter(Profile.id == profile_id).first()
+    profile = await _get_profile(db, Profile.id == profile_id)
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
     
-    db.delete(profile)
-    db.commit()
+    await db.delete(profile)
+    await db.commit()
     return {"message": "Profile deleted successfully"}
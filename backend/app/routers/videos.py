@@ -2,69 +2,104 @@
 Video router for API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from app.config import settings
+from app.utils.admission import scrape_admission
 from app.utils.database import get_db
+from app.utils.fieldsets import fields_query, parse_fields
+from app.utils.metrics import span
+from app.utils.partitioning import url_lock_statement
+from app.utils.serialization import (
+    ORJSONResponse, list_response, schema_columns, should_stream, stream_list_response, stream_rows
+)
 from app.models.video import Video
 from app.schemas.video import VideoCreate, VideoUpdate, Video as VideoSchema, VideoList
 from app.services.instagram_scraper import InstagramScraper
 
 router = APIRouter()
 
+# Fields of the Video response schema; large ones are deferred on list endpoints
+VIDEO_FIELDS = list(VideoSchema.model_fields)
+VIDEO_LIST_FIELDS = [name for name in VIDEO_FIELDS if name not in settings.LIST_DEFERRED_FIELDS]
+
 @router.get("/", response_model=VideoList)
 async def get_videos(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
 ):
-    """Get all videos with pagination"""
-    videos = db.query(Video).offset(skip).limit(limit).all()
-    total = db.query(Video).count()
-    
-    return VideoList(
-        videos=videos,
-        total=total,
-        page=skip // limit + 1,
-        size=limit
+    """Get all videos with pagination (transcription only when requested via ?fields=)"""
+    selected = parse_fields(fields, VIDEO_FIELDS, default=VIDEO_LIST_FIELDS)
+    statement = (
+        select(*schema_columns(VideoSchema, Video.__table__, selected))
+        .order_by(Video.id).offset(skip).limit(limit)
     )
+    total = await db.scalar(select(func.count()).select_from(Video))
+    page = skip // limit + 1
+    
+    if should_stream(limit):
+        return stream_list_response("videos", stream_rows(statement), total, page, limit)
+    
+    result = await db.execute(statement)
+    videos = [dict(row) for row in result.mappings()]
+    return list_response("videos", videos, total, page, limit)
 
 @router.get("/{video_id}", response_model=VideoSchema)
-async def get_video(video_id: int, db: Session = Depends(get_db)):
+async def get_video(
+    video_id: int,
+    fields: Optional[str] = fields_query(),
+    db: AsyncSession = Depends(get_db)
+):
     """Get video by ID"""
-    video = db.query(Video).filter(Video.id == video_id).first()
+    selected = parse_fields(fields, VIDEO_FIELDS)
+    result = await db.execute(
+        select(*schema_columns(VideoSchema, Video.__table__, selected)).filter(Video.id == video_id)
+    )
+    video = result.mappings().first()
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
-    return video
+    return ORJSONResponse(dict(video))
 
-@router.post("/scrape", response_model=VideoSchema)
+@router.post("/scrape", response_model=VideoSchema, dependencies=[Depends(scrape_admission)])
 async def scrape_video(
     url: str,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    """Scrape data from Instagram video URL"""
+    """Scrape data from Instagram video URL (admission-controlled: 429/503 with Retry-After when busy)"""
     scraper = InstagramScraper()
-    data = scraper.scrape_video_data(url)
+    # Scraping blocks on Apify polling and Whisper; keep it off the event loop
+    data = await run_in_threadpool(scraper.scrape_video_data, url)
     
     if not data:
         raise HTTPException(status_code=400, detail="Failed to scrape video data")
     
-    # Check if video already exists
-    existing_video = db.query(Video).filter(Video.url == url).first()
-    if existing_video:
-        # Update existing video
-        for key, value in data.items():
-            if hasattr(existing_video, key):
-                setattr(existing_video, key, value)
-        db.commit()
-        db.refresh(existing_video)
-        return existing_video
-    
-    # Create new video
-    video_data = VideoCreate(**data)
-    db_video = Video(**video_data.dict())
-    db.add(db_video)
-    db.commit()
-    db.refresh(db_video)
+    with span("db_upsert"):
+        # Serialize writers of this url (only unique per partition when partitioned)
+        url_lock = url_lock_statement(db.get_bind().dialect.name, [url])
+        if url_lock is not None:
+            await db.execute(url_lock)
+        # Check if video already exists
+        result = await db.execute(select(Video).filter(Video.url == url))
+        existing_video = result.scalars().first()
+        if existing_video:
+            # Update existing video
+            for key, value in data.items():
+                if hasattr(existing_video, key):
+                    setattr(existing_video, key, value)
+            await db.commit()
+            await db.refresh(existing_video)
+            return existing_video
+        
+        # Create new video
+        video_data = VideoCreate(**data)
+        db_video = Video(**video_data.dict())
+        db.add(db_video)
+        await db.commit()
+        await db.refresh(db_video)
     
     return db_video
 
@@ -72,10 +107,10 @@ async def scrape_video(
 async def update_video(
     video_id: int,
     video_update: VideoUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update video data"""
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await db.get(Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
@@ -83,17 +118,17 @@ async def update_video(
     for key, value in update_data.items():
         setattr(video, key, value)
     
-    db.commit()
-    db.refresh(video)
+    await db.commit()
+    await db.refresh(video)
     return video
 
 @router.delete("/{video_id}")
-async def delete_video(video_id: int, db: Session = Depends(get_db)):
+async def delete_video(video_id: int, db: AsyncSession = Depends(get_db)):
     """Delete video"""
-    video = db.query(Video).filter(Video.id == video_id).first()
+    video = await db.get(Video, video_id)
     if not video:
         raise HTTPException(status_code=404, detail="Video not found")
     
-    db.delete(video)
-    db.commit()
+    await db.delete(video)
+    await db.commit()
     return {"message": "Video deleted successfully"}
@@ -0,0 +1,155 @@
+"""
+Apify API calls through the shared rate limiter and retry policy, and run completion
+"""
+import base64
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+import requests
+from app.config import settings
+from app.utils import metrics
+from app.utils.rate_limit import create_bucket
+from app.utils.retry import request_with_retry
+
+try:
+    import redis
+except ImportError:  # Optional: only needed when REDIS_URL is set
+    redis = None
+
+# One bucket per process (or one Redis key for all workers when REDIS_URL is set)
+apify_bucket = create_bucket("apify", settings.APIFY_RATE_PER_SECOND, settings.APIFY_RATE_BURST)
+
+def apify_request(method: str, path: str, **kwargs) -> requests.Response:
+    """Rate-limited, retried request to the Apify API (path relative to APIFY_API_URL)"""
+    headers = {"Authorization": f"Bearer {settings.APIFY_TOKEN}", **kwargs.pop("headers", {})}
+    return request_with_retry(
+        method, f"{settings.APIFY_API_URL}{path}", target="apify", bucket=apify_bucket, headers=headers, **kwargs
+    )
+
+# Run completion: Apify webhook callbacks, with adaptive polling as the fallback
+
+TERMINAL_STATUSES = {"SUCCEEDED", "FAILED", "TIMED-OUT", "ABORTED"}
+WEBHOOK_EVENT_TYPES = ["ACTOR.RUN.SUCCEEDED", "ACTOR.RUN.FAILED", "ACTOR.RUN.TIMED_OUT", "ACTOR.RUN.ABORTED"]
+SHARED_STATUS_PREFIX = "pocket:apify:run:"
+SHARED_CHECK_INTERVAL = 1.0  # seconds between checks for statuses delivered to other workers
+
+class PendingRuns:
+    """
+    Runs this process is waiting on, resolved by the webhook endpoint. Webhooks may
+    land on another worker (or arrive before the run is registered): statuses are
+    kept briefly for late registrations and, with REDIS_URL set, published in Redis
+    for the other workers; anything still missed is caught by fallback polling.
+    """
+
+    def __init__(self, redis_url: str = "", keep_completed: int = 1000, shared_ttl: int = 3600):
+        self._events: Dict[str, threading.Event] = {}
+        self._statuses: "OrderedDict[str, str]" = OrderedDict()
+        self._keep_completed = keep_completed
+        self._shared_ttl = shared_ttl
+        self._lock = threading.Lock()
+        self._redis = None  # set when statuses are shared between workers
+        if redis_url:
+            if redis is None:
+                raise RuntimeError("redis package is not installed (pip install redis)")
+            self._redis = redis.Redis.from_url(redis_url)
+
+    @property
+    def shared(self) -> bool:
+        return self._redis is not None
+
+    def register(self, run_id: str) -> threading.Event:
+        with self._lock:
+            event = self._events.setdefault(run_id, threading.Event())
+            if run_id in self._statuses:
+                event.set()
+            return event
+
+    def discard(self, run_id: str):
+        with self._lock:
+            self._events.pop(run_id, None)
+            self._statuses.pop(run_id, None)
+
+    def status(self, run_id: str) -> Optional[str]:
+        """Terminal status delivered by a webhook to this or (via Redis) another worker"""
+        status = self._statuses.get(run_id)
+        if status is None and self._redis is not None:
+            shared = self._redis.get(SHARED_STATUS_PREFIX + run_id)
+            status = shared.decode() if shared else None
+        return status
+
+    def resolve(self, run_id: str, status: str, publish: bool = True) -> bool:
+        """Record a run's terminal status; True when a job in this process was waiting on it"""
+        with self._lock:
+            self._statuses[run_id] = status
+            while len(self._statuses) > self._keep_completed:
+                self._statuses.popitem(last=False)
+            event = self._events.get(run_id)
+        if publish and self._redis is not None:
+            self._redis.set(SHARED_STATUS_PREFIX + run_id, status, ex=self._shared_ttl)
+        if event is None:
+            return False
+        event.set()
+        return True
+
+pending_runs = PendingRuns(settings.REDIS_URL)
+
+def webhook_enabled() -> bool:
+    """Webhooks need a callback URL and a dedicated secret (never SECRET_KEY: it ends up in the URL)"""
+    return bool(settings.APIFY_WEBHOOK_URL and settings.APIFY_WEBHOOK_SECRET)
+
+def webhook_param() -> str:
+    """Base64 ad-hoc webhook definition for the `webhooks` query parameter of a run start"""
+    callback = f"{settings.APIFY_WEBHOOK_URL}?{urlencode({'token': settings.APIFY_WEBHOOK_SECRET})}"
+    webhooks = [{"eventTypes": WEBHOOK_EVENT_TYPES, "requestUrl": callback}]
+    return base64.b64encode(json.dumps(webhooks).encode()).decode()
+
+def start_run(actor_id: str, payload: Dict[str, Any]) -> requests.Response:
+    """Start an actor run, asking Apify to call the webhook endpoint when it finishes"""
+    params = {"webhooks": webhook_param()} if webhook_enabled() else None
+    return apify_request("POST", f"/acts/{actor_id}/runs", json=payload, params=params, timeout=60)
+
+def wait_for_run(run_id: str, timeout: float = None) -> str:
+    """
+    Terminal status of a run, or "WAIT-TIMEOUT". Returns as soon as the webhook
+    resolves it; status polls back off from SCRAPING_DELAY to APIFY_POLL_MAX_INTERVAL.
+    Polls start at the max (only a safety net) when webhooks are shared through Redis;
+    without Redis a webhook landing on another worker is only seen by polling, so it
+    keeps the pace it has without webhooks.
+    """
+    timeout = settings.APIFY_RUN_TIMEOUT if timeout is None else timeout
+    webhook_reaches_us = webhook_enabled() and pending_runs.shared
+    interval = settings.APIFY_POLL_MAX_INTERVAL if webhook_reaches_us else settings.SCRAPING_DELAY
+    shared_check = SHARED_CHECK_INTERVAL if pending_runs.shared else timeout
+    event = pending_runs.register(run_id)
+    start = time.monotonic()
+    deadline = start + timeout
+    next_poll = start + interval
+    polls = 0
+    try:
+        while True:
+            status = pending_runs.status(run_id)
+            if status is not None:
+                metrics.APIFY_RUN_COMPLETIONS.labels(source="webhook").inc()
+                return status
+
+            now = time.monotonic()
+            if now >= next_poll:
+                if polls:
+                    metrics.STAGE_RETRIES.labels(stage="apify_poll").inc()
+                polls += 1
+                response = apify_request("GET", f"/actor-runs/{run_id}")
+                response.raise_for_status()
+                status = response.json()["data"]["status"]
+                if status in TERMINAL_STATUSES:
+                    metrics.APIFY_RUN_COMPLETIONS.labels(source="poll").inc()
+                    return status
+                interval = min(interval * 1.5, settings.APIFY_POLL_MAX_INTERVAL)
+                next_poll = time.monotonic() + interval
+            if now >= deadline:
+                return "WAIT-TIMEOUT"
+            event.wait(max(0.0, min(next_poll, deadline, now + shared_check) - now))
+    finally:
+        pending_runs.discard(run_id)
@@ -5,9 +5,15 @@ import requests
 import tempfile
 import subprocess
 import os
-import whisper
 from typing import Optional, Dict, Any
 from app.config import settings
+from app.services.apify import apify_request, start_run, wait_for_run
+from app.services.transcription import transcribe
+from app.utils.admission import stage_slot
+from app.utils.metrics import AUDIO_SECONDS, BYTES_DOWNLOADED, STAGE_FAILURES, span
+
+# 16 kHz mono 16-bit PCM (the format _extract_audio asks FFmpeg for)
+WAV_BYTES_PER_SECOND = 16000 * 2
 
 class InstagramScraper:
     """Instagram scraper service"""
@@ -27,12 +33,14 @@ class InstagramScraper:
             temp_file.close()
             
             # Download video
-            response = requests.get(video_url, stream=True, timeout=30)
-            response.raise_for_status()
-            
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            with span("download"):
+                response = requests.get(video_url, stream=True, timeout=30)
+                response.raise_for_status()
+                
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+                        BYTES_DOWNLOADED.inc(len(chunk))
             
             print(f"✅ Vídeo baixado: {temp_path}")
             return temp_path
@@ -62,12 +70,14 @@ class InstagramScraper:
                 audio_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            with span("audio_extract"):
+                result = subprocess.run(cmd, capture_output=True, text=True)
             
             if result.returncode == 0:
                 print(f"✅ Áudio extraído: {audio_path}")
                 return audio_path
             else:
+                STAGE_FAILURES.labels(stage="audio_extract").inc()
                 print(f"❌ Erro FFmpeg: {result.stderr}")
                 return None
                 
@@ -80,13 +90,11 @@ class InstagramScraper:
         try:
             print("🎤 Transcrevendo áudio...")
             
-            # Load Whisper model
-            model = whisper.load_model("base")
+            # Model is loaded once per process (or lives in the transcription server)
+            with span("transcribe"):
+                transcription = transcribe(audio_path)
+            AUDIO_SECONDS.inc(max(0, os.path.getsize(audio_path) - 44) / WAV_BYTES_PER_SECOND)
             
-            # Transcribe audio
-            result = model.transcribe(audio_path, language="pt")
-            
-            transcription = result["text"].strip()
             print(f"✅ Transcrição concluída: {len(transcription)} caracteres")
             
             return transcription
@@ -125,72 +133,81 @@ class InstagramScraper:
     
     def scrape_video_data(self, instagram_url: str) -> Optional[Dict[str, Any]]:
         """Scrape data from Instagram video"""
-        print(f"\n🔍 Processando: {instagram_url}")
+        with span("scrape_total"):
+            data = self._scrape_video_data(instagram_url)
+        if data is None:
+            STAGE_FAILURES.labels(stage="scrape_total").inc()
+        return data
+    
+    def _run_apify(self, instagram_url: str) -> Optional[Dict[str, Any]]:
+        """Start an Apify run for one URL, wait for it and return its first dataset item"""
+        # Apify calls share one rate limiter and are retried with backoff (app.services.apify)
+        payload = {
+            "directUrls": [instagram_url],
+            "resultsType": "posts",
+            "resultsLimit": 1
+        }
         
-        try:
-            # Apify API configuration
-            apify_url = f"https://api.apify.com/v2/acts/{self.apify_actor_id}/runs"
-            
-            payload = {
-                "directUrls": [instagram_url],
-                "resultsType": "posts",
-                "resultsLimit": 1
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.apify_token}"
-            }
-            
-            # Execute scraper
-            print("🚀 Executando scraper Apify...")
-            response = requests.post(apify_url, json=payload, headers=headers, timeout=60)
-            
-            if response.status_code not in [200, 201]:
-                print(f"❌ Erro HTTP {response.status_code}: {response.text}")
-                return None
-            
-            run_data = response.json()
-            run_id = run_data["data"]["id"]
-            
-            print(f"⏳ Aguardando conclusão... (Run ID: {run_id})")
-            
-            # Wait for completion
-            import time
-            max_attempts = 30
-            for attempt in range(max_attempts):
-                time.sleep(2)
-                
-                status_url = f"https://api.apify.com/v2/actor-runs/{run_id}"
-                status_response = requests.get(status_url, headers=headers)
-                status_data = status_response.json()
-                
-                if status_data["data"]["status"] == "SUCCEEDED":
-                    print("✅ Scraper concluído!")
-                    break
-                elif status_data["data"]["status"] == "FAILED":
-                    print("❌ Scraper falhou!")
-                    return None
-            else:
-                print("⏰ Timeout aguardando scraper")
-                return None
-            
-            # Get results
-            dataset_url = f"https://api.apify.com/v2/actor-runs/{run_id}/dataset/items"
-            dataset_response = requests.get(dataset_url, headers=headers)
+        # Execute scraper
+        print("🚀 Executando scraper Apify...")
+        with span("apify_start"):
+            response = start_run(self.apify_actor_id, payload)
+        
+        if response.status_code not in [200, 201]:
+            STAGE_FAILURES.labels(stage="apify_start").inc()
+            print(f"❌ Erro HTTP {response.status_code}: {response.text}")
+            return None
+        
+        run_data = response.json()
+        run_id = run_data["data"]["id"]
+        
+        print(f"⏳ Aguardando conclusão... (Run ID: {run_id})")
+        
+        # Wait for completion (webhook callback when APIFY_WEBHOOK_URL is set, polling otherwise)
+        with span("apify_poll"):
+            status = wait_for_run(run_id)
+        
+        if status == "WAIT-TIMEOUT":
+            STAGE_FAILURES.labels(stage="apify_poll").inc()
+            print("⏰ Timeout aguardando scraper")
+            return None
+        if status != "SUCCEEDED":
+            STAGE_FAILURES.labels(stage="apify_poll").inc()
+            print(f"❌ Scraper falhou! ({status})")
+            return None
+        print("✅ Scraper concluído!")
+        
+        # Get results
+        with span("apify_dataset"):
+            dataset_response = apify_request("GET", f"/actor-runs/{run_id}/dataset/items")
             dataset_response.raise_for_status()
             
             items = dataset_response.json()
-            
-            if not items:
-                print("❌ Nenhum item encontrado")
-                return None
-            
-            item = items[0]
-            
-            # Verifica se há erro no resultado
-            if "error" in item:
-                print(f"❌ Erro do Apify: {item.get('error')} - {item.get('errorDescription', 'Sem descrição')}")
+        
+        if not items:
+            STAGE_FAILURES.labels(stage="apify_dataset").inc()
+            print("❌ Nenhum item encontrado")
+            return None
+        
+        item = items[0]
+        
+        # Verifica se há erro no resultado
+        if "error" in item:
+            STAGE_FAILURES.labels(stage="apify_dataset").inc()
+            print(f"❌ Erro do Apify: {item.get('error')} - {item.get('errorDescription', 'Sem descrição')}")
+            return None
+        
+        return item
+    
+    def _scrape_video_data(self, instagram_url: str) -> Optional[Dict[str, Any]]:
+        """Apify run, download, audio extraction and transcription for one URL"""
+        print(f"\n🔍 Processando: {instagram_url}")
+        
+        try:
+            # Apify run (I/O-bound stage, limited separately from transcription)
+            with stage_slot("apify"):
+                item = self._run_apify(instagram_url)
+            if item is None:
                 return None
             
             # Extract basic data
@@ -240,15 +257,17 @@ class InstagramScraper:
                 audio_temp = None
                 
                 if video_temp:
-                    # Extract audio
-                    audio_temp = self._extract_audio(video_temp)
-                    
-                    if audio_temp:
-                        # Transcribe
-                        transcription = self._transcribe_audio(audio_temp)
-                        data['transcription'] = transcription
-                    else:
-                        data['transcription'] = 'SEM_AUDIO'
+                    # ffmpeg + Whisper are CPU-bound; limited separately from Apify runs
+                    with stage_slot("transcribe"):
+                        # Extract audio
+                        audio_temp = self._extract_audio(video_temp)
+                        
+                        if audio_temp:
+                            # Transcribe
+                            transcription = self._transcribe_audio(audio_temp)
+                            data['transcription'] = transcription
+                        else:
+                            data['transcription'] = 'SEM_AUDIO'
                 else:
                     data['transcription'] = 'ERRO_DOWNLOAD'
                 
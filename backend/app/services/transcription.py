@@ -0,0 +1,86 @@
+"""
+Whisper model loading and transcription
+
+whisper pulls in torch and numpy (seconds of import time and hundreds of MB of
+RSS), so it is imported on the first transcription instead of at module load.
+Read-only API workers never pay for it.
+
+TRANSCRIPTION_MODE picks where the model lives: in each worker ("local"), in the
+gunicorn master before it forks ("preload", pages shared copy-on-write), or in a
+single transcription_server.py process the workers call over a Unix socket ("ipc").
+"""
+import os
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, Optional
+from app.config import settings
+from app.utils.metrics import span
+
+_model: Optional[Any] = None
+_model_lock = threading.Lock()
+_transcribe_lock = threading.Lock()
+
+def get_whisper_model() -> Any:
+    """Process-wide Whisper model, imported and loaded on first use"""
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                with span("whisper_load"):
+                    import whisper
+                    _model = whisper.load_model(settings.WHISPER_MODEL)
+    return _model
+
+def _authkey() -> bytes:
+    return settings.SECRET_KEY.encode()
+
+def _transcribe_local(audio_path: str, language: str) -> str:
+    # One transcription at a time per model: decoding installs kv-cache hooks on the shared modules
+    model = get_whisper_model()
+    with _transcribe_lock:
+        result = model.transcribe(audio_path, language=language)
+    return result["text"].strip()
+
+def _transcribe_ipc(audio_path: str, language: str) -> str:
+    with Client(settings.TRANSCRIPTION_SOCKET, family="AF_UNIX", authkey=_authkey()) as conn:
+        conn.send({"audio_path": os.path.abspath(audio_path), "language": language})
+        if not conn.poll(settings.TRANSCRIPTION_TIMEOUT):
+            raise TimeoutError(f"No transcription after {settings.TRANSCRIPTION_TIMEOUT}s")
+        reply = conn.recv()
+    if "error" in reply:
+        raise RuntimeError(f"Transcription server: {reply['error']}")
+    return reply["text"]
+
+def transcribe(audio_path: str, language: str = None) -> str:
+    """Transcribe an audio file (must be readable by the transcription server in ipc mode)"""
+    language = language or settings.WHISPER_LANGUAGE
+    if settings.TRANSCRIPTION_MODE == "ipc":
+        return _transcribe_ipc(audio_path, language)
+    return _transcribe_local(audio_path, language)
+
+def _handle(conn):
+    with conn:
+        try:
+            request: Dict[str, str] = conn.recv()
+            text = _transcribe_local(request["audio_path"], request.get("language") or settings.WHISPER_LANGUAGE)
+            conn.send({"text": text})
+        except EOFError:
+            pass
+        except Exception as e:
+            conn.send({"error": f"{type(e).__name__}: {e}"})
+
+def serve(socket_path: str = None):
+    """Load the model once and answer transcription requests on a Unix socket (blocks)"""
+    socket_path = socket_path or settings.TRANSCRIPTION_SOCKET
+    get_whisper_model()
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with Listener(socket_path, family="AF_UNIX", authkey=_authkey()) as listener:
+        print(f"🎤 Transcription server ready on {socket_path} (model: {settings.WHISPER_MODEL})")
+        while True:
+            try:
+                conn = listener.accept()
+            except Exception as e:  # failed handshake (e.g. wrong authkey)
+                print(f"⚠️ Rejected transcription client: {e}")
+                continue
+            threading.Thread(target=_handle, args=(conn,), daemon=True).start()
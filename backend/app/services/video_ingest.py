@@ -0,0 +1,105 @@
+"""
+Batched video upserts for streamed scraper output
+"""
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.models.video import Video
+from app.models.profile import Profile
+from app.utils.partitioning import url_lock_statement
+
+# Scraper post fields that map onto Video columns (None means "not observed")
+METRIC_FIELDS = ("likes", "comments", "views")
+
+
+def engagement_rates(likes: int, comments: int, views: int) -> Tuple[float, float]:
+    """(likes/views)*100 and (comments/views)*100, rounded like the Apify scraper"""
+    if not views:
+        return 0.0, 0.0
+    return round((likes / views) * 100, 2), round((comments / views) * 100, 2)
+
+
+def _parse_datetime(value: Any) -> Optional[datetime]:
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def post_to_video_fields(post: Dict[str, Any]) -> Dict[str, Any]:
+    """Video column values from a scraper post dict, skipping metrics the grid did not expose"""
+    username = post.get("username") or ""
+    fields = {
+        "url": post["url"],
+        "username": username if username.startswith("@") else f"@{username}",
+    }
+    for field in METRIC_FIELDS:
+        if post.get(field) is not None:
+            fields[field] = int(post[field])
+    posted_at = _parse_datetime(post.get("posted_at"))
+    if posted_at:
+        fields["posted_at"] = posted_at
+    return fields
+
+
+def _batches(items: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def upsert_videos(db: Session, posts: Iterable[Dict[str, Any]], batch_size: int = 100) -> Dict[str, int]:
+    """
+    Insert or update videos by URL as posts arrive, committing every batch_size
+    posts so arbitrarily long streams never sit in memory.
+    """
+    stats = {"inserted": 0, "updated": 0}
+    profile_ids: Dict[str, Optional[int]] = {}
+
+    for batch in _batches(posts, batch_size):
+        rows = {}
+        for post in batch:
+            fields = post_to_video_fields(post)
+            rows[fields["url"]] = fields  # Last occurrence wins within a batch
+
+        # With partitioning url is only unique per partition; serialize writers of these urls
+        url_lock = url_lock_statement(db.get_bind().dialect.name, rows)
+        if url_lock is not None:
+            db.execute(url_lock)
+        existing = {
+            video.url: video
+            for video in db.scalars(select(Video).where(Video.url.in_(list(rows))))
+        }
+
+        for url, fields in rows.items():
+            video = existing.get(url)
+            if video is None:
+                username = fields["username"].lstrip("@")
+                if username not in profile_ids:
+                    profile_ids[username] = db.scalar(
+                        select(Profile.id).where(Profile.username.in_([username, f"@{username}"]))
+                    )
+                video = Video(profile_id=profile_ids[username], **fields)
+                db.add(video)
+                stats["inserted"] += 1
+            else:
+                for key, value in fields.items():
+                    setattr(video, key, value)
+                stats["updated"] += 1
+
+            video.likes_rate, video.comments_rate = engagement_rates(
+                video.likes or 0, video.comments or 0, video.views or 0
+            )
+
+        db.commit()
+        db.expunge_all()
+
+    return stats
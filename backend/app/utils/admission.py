@@ -0,0 +1,147 @@
+"""
+Admission control for expensive endpoints and pipeline stages
+
+Endpoint limiters admit a fixed number of requests at once and queue a bounded
+number more; a request finding the queue full is rejected at once with 429, one
+that waits longer than the queue timeout gets 503, both with a Retry-After
+estimated from recent hold times. Stage limiters bound CPU-heavy (ffmpeg +
+Whisper) and I/O-heavy (Apify) work inside admitted requests; they only queue,
+since the endpoint limiter already bounds how many threads can wait on them.
+A limit of 0 disables a limiter.
+"""
+import asyncio
+import math
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Optional
+from fastapi import HTTPException
+from app.config import settings
+from app.utils import metrics
+
+MAX_RETRY_AFTER = 300  # seconds
+
+class _Limiter:
+    """Counters, metrics and Retry-After estimate shared by both limiter kinds"""
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+        self._avg_hold: Optional[float] = None  # moving average of seconds a slot is held
+        self._lock = threading.Lock()
+
+    def _queued(self, delta: int):
+        with self._lock:
+            self.waiting += delta
+            metrics.ADMISSION_QUEUE_DEPTH.labels(limiter=self.name).set(self.waiting)
+
+    def _admitted(self, waited: float):
+        metrics.ADMISSION_WAIT_SECONDS.labels(limiter=self.name).observe(waited)
+        with self._lock:
+            self.active += 1
+            metrics.ADMISSION_IN_FLIGHT.labels(limiter=self.name).set(self.active)
+
+    def _finished(self, held: float):
+        with self._lock:
+            self.active -= 1
+            self._avg_hold = held if self._avg_hold is None else 0.8 * self._avg_hold + 0.2 * held
+            metrics.ADMISSION_IN_FLIGHT.labels(limiter=self.name).set(self.active)
+
+    def retry_after(self, default: float) -> int:
+        """Seconds until a slot is likely free for a request joining the queue now"""
+        if self._avg_hold is None:
+            return max(1, min(MAX_RETRY_AFTER, math.ceil(default)))
+        estimate = self._avg_hold * (self.waiting + 1) / max(self.limit, 1)
+        return max(1, min(MAX_RETRY_AFTER, math.ceil(estimate)))
+
+class AdmissionLimiter(_Limiter):
+    """Concurrency limit with a bounded wait queue for an async endpoint"""
+
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        super().__init__(name, limit)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+
+    def _reject(self, status_code: int, reason: str, detail: str):
+        metrics.ADMISSION_REJECTIONS.labels(limiter=self.name, reason=reason).inc()
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(self.retry_after(self.queue_timeout))},
+        )
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        if self._semaphore is None:
+            yield
+            return
+        start = time.perf_counter()
+        if not self._semaphore.locked():
+            # Free slot: acquire() returns without suspending
+            await self._semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            self._reject(429, "queue_full", f"Too many concurrent {self.name} requests")
+        else:
+            self._queued(1)
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self._reject(503, "timeout", f"Timed out waiting for a {self.name} slot")
+            finally:
+                self._queued(-1)
+
+        admitted = time.perf_counter()
+        self._admitted(admitted - start)
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+            self._finished(time.perf_counter() - admitted)
+
+    async def __call__(self):
+        """FastAPI dependency holding a slot for the rest of the request"""
+        async with self.slot():
+            yield
+
+class StageLimiter(_Limiter):
+    """Concurrency limit for a blocking pipeline stage (runs in worker threads)"""
+
+    def __init__(self, name: str, limit: int):
+        super().__init__(name, limit)
+        self._semaphore = threading.BoundedSemaphore(limit) if limit > 0 else None
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        if self._semaphore is None:
+            yield
+            return
+        start = time.perf_counter()
+        self._queued(1)
+        try:
+            self._semaphore.acquire()
+        finally:
+            self._queued(-1)
+
+        admitted = time.perf_counter()
+        self._admitted(admitted - start)
+        try:
+            yield
+        finally:
+            self._semaphore.release()
+            self._finished(time.perf_counter() - admitted)
+
+scrape_admission = AdmissionLimiter(
+    "scrape", settings.SCRAPE_MAX_CONCURRENT, settings.SCRAPE_MAX_QUEUE, settings.SCRAPE_QUEUE_TIMEOUT
+)
+
+STAGE_LIMITERS: Dict[str, StageLimiter] = {
+    "transcribe": StageLimiter("transcribe", settings.TRANSCRIBE_MAX_CONCURRENT),
+    "apify": StageLimiter("apify", settings.APIFY_MAX_CONCURRENT),
+}
+
+def stage_slot(name: str):
+    """Hold a slot of the named stage limiter for the duration of a with-block"""
+    return STAGE_LIMITERS[name].slot()
@@ -1,25 +1,86 @@
 """
 Database configuration and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.utils.query_stats import instrument_engine
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+# Sync drivers mapped to their asyncio counterparts
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Translate a sync database URL into one using an asyncio driver"""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database URL scheme '{scheme}'")
+    return f"{ASYNC_DRIVERS[dialect]}{sep}{rest}"
+
+def get_engine_options(url: str) -> dict:
+    """Engine keyword arguments for the configured tuning profile"""
+    if "sqlite" in url:
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLite pragmas to every new connection (WAL lets readers and writers overlap)"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        # Negative cache_size is interpreted by SQLite as KiB instead of pages
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+def configure_engine(sync_engine):
+    """Attach connection-level tuning to an engine (pass async_engine.sync_engine for async)"""
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+    if settings.SQL_INSTRUMENTATION:
+        instrument_engine(sync_engine)
+    return sync_engine
+
+# Create database engine (sync, used by scripts such as init_db.py)
+engine = create_engine(settings.DATABASE_URL, **get_engine_options(settings.DATABASE_URL))
+configure_engine(engine)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async database engine (used by the API routers)
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL))
+configure_engine(async_engine.sync_engine)
+
+# Create async session factory
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
-def get_db():
-    """Dependency to get database session"""
+async def get_db():
+    """Dependency to get async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_sync_db():
+    """Get sync database session (scripts and background jobs)"""
     db = SessionLocal()
     try:
         yield db
@@ -28,4 +89,9 @@ def get_db():
 
 def create_tables():
     """Create all tables"""
+    if settings.DB_PARTITIONING and engine.dialect.name == "postgresql":
+        from app.utils.partitioning import create_partitioned_tables
+        with engine.begin() as conn:
+            create_partitioned_tables(conn)
+        return
     Base.metadata.create_all(bind=engine)
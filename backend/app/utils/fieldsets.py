@@ -0,0 +1,26 @@
+"""
+Sparse fieldsets (`?fields=id,url,views`) for list and detail endpoints
+"""
+from typing import List, Optional, Sequence
+from fastapi import HTTPException, Query
+
+def fields_query():
+    """`fields` query parameter shared by endpoints supporting sparse fieldsets"""
+    return Query(None, description="Comma-separated list of fields to return (e.g. id,url,views)")
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], default: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Resolve a `?fields=` value against the allowed field names.
+    Returns names in `allowed` order; `id` is always included when allowed.
+    """
+    if not fields:
+        return list(default if default is not None else allowed)
+
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(requested.difference(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+    return [name for name in allowed if name in requested or name == "id"]
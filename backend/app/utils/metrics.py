@@ -0,0 +1,99 @@
+"""
+Prometheus metrics of the API (prometheus_client), rendered at /metrics
+
+Values are per process: with several uvicorn workers, scrape each worker or
+run a single worker behind the metrics scraper.
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+
+# Pipeline stages run far longer than the client's default buckets (which stop at 10s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+# Scrape pipeline
+STAGE_SECONDS = Histogram(
+    "pocket_stage_duration_seconds", "Duration of scrape pipeline stages", ["stage"],
+    buckets=DEFAULT_BUCKETS,
+)
+STAGE_FAILURES = Counter(
+    "pocket_stage_failures_total", "Scrape pipeline stage failures", ["stage"]
+)
+STAGE_RETRIES = Counter(
+    "pocket_stage_retries_total", "Retries/extra polls within a stage", ["stage"]
+)
+BYTES_DOWNLOADED = Counter(
+    "pocket_download_bytes_total", "Bytes of media downloaded for transcription"
+)
+AUDIO_SECONDS = Counter(
+    "pocket_transcribed_audio_seconds_total", "Seconds of audio transcribed"
+)
+
+# Database (recorded when SQL_INSTRUMENTATION is on)
+SQL_STATEMENTS_PER_REQUEST = Histogram(
+    "pocket_sql_statements_per_request", "SQL statements executed per API request",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 500),
+)
+SQL_SECONDS_PER_REQUEST = Histogram(
+    "pocket_sql_duration_per_request_seconds", "Total SQL time per API request",
+    buckets=DEFAULT_BUCKETS,
+)
+SQL_SLOW_STATEMENTS = Counter(
+    "pocket_sql_slow_statements_total", "Statements slower than SQL_SLOW_QUERY_MS"
+)
+SQL_REPEATED_REQUESTS = Counter(
+    "pocket_sql_repeated_statement_requests_total", "Requests repeating an identical statement (possible N+1)"
+)
+
+# Admission control (limiter: endpoint or stage name)
+ADMISSION_IN_FLIGHT = Gauge(
+    "pocket_admission_in_flight", "Requests or stage runs currently holding a slot", ["limiter"]
+)
+ADMISSION_QUEUE_DEPTH = Gauge(
+    "pocket_admission_queue_depth", "Requests or stage runs waiting for a slot", ["limiter"]
+)
+ADMISSION_WAIT_SECONDS = Histogram(
+    "pocket_admission_wait_seconds", "Time spent waiting for a slot", ["limiter"],
+    buckets=DEFAULT_BUCKETS,
+)
+ADMISSION_REJECTIONS = Counter(
+    "pocket_admission_rejections_total", "Requests rejected by admission control", ["limiter", "reason"]
+)
+
+# Outbound calls
+OUTBOUND_RETRIES = Counter(
+    "pocket_outbound_retries_total", "Retried outbound HTTP calls", ["target", "reason"]
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "pocket_rate_limit_wait_seconds", "Time spent waiting for a rate-limit token", ["limiter"],
+    buckets=DEFAULT_BUCKETS,
+)
+
+APIFY_RUN_COMPLETIONS = Counter(
+    "pocket_apify_run_completions_total", "Apify runs seen finishing, by how completion was detected", ["source"]
+)
+
+# HTTP API
+HTTP_REQUEST_SECONDS = Histogram(
+    "pocket_http_request_duration_seconds", "API request latency", ["method", "route", "status"],
+    buckets=DEFAULT_BUCKETS,
+)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a pipeline stage; an exception escaping the block counts as a stage failure"""
+    start = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        STAGE_FAILURES.labels(stage=stage).inc()
+        raise
+    finally:
+        STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def render() -> bytes:
+    return generate_latest(REGISTRY)
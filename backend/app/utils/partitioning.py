@@ -0,0 +1,218 @@
+"""
+Monthly range partitioning for PostgreSQL deployments
+
+Partitioned tables are created as `PARTITION BY RANGE (<key>)` with one child table per
+month (`videos_p2025_09`) plus a default partition for rows without a date. Unique
+constraints live on each partition because PostgreSQL requires the partition key in
+every unique constraint of the parent and the key column is nullable, so the database
+alone would accept the same url in two partitions; writers take url_lock_statement()
+before their check-then-insert to keep it unique.
+
+Maintenance (creating and detaching partitions) is DDL and runs from
+manage_partitions.py (cron), serialized by an advisory lock, never from API workers.
+"""
+import logging
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.schema import CreateColumn
+from app.config import settings
+from app.utils.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table name -> range partition key column
+PARTITIONED_TABLES = {
+    "videos": "posted_at",
+}
+
+# Advisory lock keys (hashed by hashtext)
+MAINTENANCE_LOCK_KEY = "videos:partition-maintenance"
+URL_LOCK_PREFIX = "videos:url:"
+
+def is_partitioning_enabled(dialect_name: str) -> bool:
+    """Partitioning is opt-in and only available on PostgreSQL"""
+    return settings.DB_PARTITIONING and dialect_name == "postgresql"
+
+def lock_maintenance(conn):
+    """Hold the maintenance advisory lock until the transaction ends (one maintainer at a time)"""
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": MAINTENANCE_LOCK_KEY})
+
+def url_lock_statement(dialect_name: str, urls: Iterable[str]) -> Optional[TextClause]:
+    """
+    Statement taking a transaction advisory lock per video url (in sorted order, so
+    concurrent writers cannot deadlock), or None when url is unique across the whole
+    table anyway. Execute it before looking up existing rows by url.
+    """
+    urls = sorted(set(urls))
+    if not urls or not is_partitioning_enabled(dialect_name):
+        return None
+    return text(
+        "SELECT pg_advisory_xact_lock(hashtext(:prefix || url)) "
+        "FROM (SELECT unnest(CAST(:urls AS text[])) AS url ORDER BY 1) AS locked"
+    ).bindparams(prefix=URL_LOCK_PREFIX, urls=urls)
+
+def add_months(month: date, months: int) -> date:
+    """Return the first day of the month `months` away from `month`"""
+    index = month.year * 12 + (month.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table_name: str, month: date) -> str:
+    """Name of the partition holding `month` (e.g. videos_p2025_09)"""
+    return f"{table_name}_p{month.year:04d}_{month.month:02d}"
+
+def parse_partition_month(table_name: str, name: str) -> Optional[date]:
+    """Inverse of partition_name; None for the default partition or foreign tables"""
+    prefix = f"{table_name}_p"
+    if not name.startswith(prefix):
+        return None
+    try:
+        year, month = name[len(prefix):].split("_")
+        return date(int(year), int(month), 1)
+    except ValueError:
+        return None
+
+def list_partitions(conn, table_name: str) -> List[str]:
+    """Names of the partitions currently attached to `table_name`"""
+    result = conn.execute(text(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "JOIN pg_class p ON p.oid = i.inhparent "
+        "WHERE p.relname = :table_name ORDER BY c.relname"
+    ), {"table_name": table_name})
+    return [row[0] for row in result]
+
+def _table_exists(conn, table_name: str) -> bool:
+    return conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": table_name}).scalar()
+
+def create_partitioned_table(conn, table_name: str):
+    """Create the partitioned parent and its default partition if missing"""
+    if _table_exists(conn, table_name):
+        return
+
+    table = Base.metadata.tables[table_name]
+    key = PARTITIONED_TABLES[table_name]
+
+    definitions = [str(CreateColumn(column).compile(dialect=conn.dialect)) for column in table.columns]
+    for fk in table.foreign_key_constraints:
+        referred = fk.elements[0].column.table.name
+        local = ", ".join(fk.column_keys)
+        remote = ", ".join(element.column.name for element in fk.elements)
+        definitions.append(f"FOREIGN KEY ({local}) REFERENCES {referred} ({remote})")
+
+    conn.execute(text(
+        f"CREATE TABLE {table_name} (\n    " + ",\n    ".join(definitions) + f"\n) PARTITION BY RANGE ({key})"
+    ))
+    _attach_partition(conn, table_name, f"{table_name}_default", None)
+    logger.info(f"Created partitioned table {table_name} (range on {key})")
+
+def _attach_partition(conn, table_name: str, name: str, month: Optional[date]):
+    """
+    Create and attach one partition, moving any matching rows out of the default
+    partition first (ATTACH fails while the default partition holds rows in range)
+    """
+    key = PARTITIONED_TABLES[table_name]
+    default_name = f"{table_name}_default"
+
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS)"))
+
+    if month is None:
+        bounds = "DEFAULT"
+    else:
+        start, end = month, add_months(month, 1)
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        if _table_exists(conn, default_name):
+            conn.execute(text(
+                f"WITH moved AS (DELETE FROM {default_name} WHERE {key} >= :start AND {key} < :end RETURNING *) "
+                f"INSERT INTO {name} SELECT * FROM moved"
+            ), {"start": start, "end": end})
+
+    conn.execute(text(f"ALTER TABLE {name} ADD PRIMARY KEY (id)"))
+    for column in Base.metadata.tables[table_name].columns:
+        if column.unique:
+            conn.execute(text(f"CREATE UNIQUE INDEX {name}_{column.name}_key ON {name} ({column.name})"))
+    conn.execute(text(f"ALTER TABLE {table_name} ATTACH PARTITION {name} {bounds}"))
+
+def ensure_partitions(conn, table_name: str, today: Optional[date] = None) -> List[str]:
+    """
+    Create missing monthly partitions from PARTITION_BACKFILL_MONTHS ago up to
+    PARTITION_PRECREATE_MONTHS ahead. Returns the names of the partitions created.
+    """
+    current = (today or date.today()).replace(day=1)
+    existing = set(list_partitions(conn, table_name))
+    created = []
+
+    # Never re-create months that archive_partitions would detach again
+    oldest = -settings.PARTITION_BACKFILL_MONTHS
+    if settings.PARTITION_RETENTION_MONTHS > 0:
+        oldest = max(oldest, -settings.PARTITION_RETENTION_MONTHS)
+
+    for offset in range(oldest, settings.PARTITION_PRECREATE_MONTHS + 1):
+        month = add_months(current, offset)
+        name = partition_name(table_name, month)
+        if name in existing:
+            continue
+        _attach_partition(conn, table_name, name, month)
+        created.append(name)
+
+    if created:
+        logger.info(f"Created {len(created)} partition(s) for {table_name}: {', '.join(created)}")
+    return created
+
+def archive_partitions(conn, table_name: str, today: Optional[date] = None,
+                       retention_months: Optional[int] = None, drop: bool = False) -> List[Tuple[str, str]]:
+    """
+    Detach partitions whose month ended more than `retention_months` ago.
+    Detached tables are moved to PARTITION_ARCHIVE_SCHEMA (or dropped when `drop`).
+    Returns (partition, action) pairs.
+    """
+    retention_months = settings.PARTITION_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention_months <= 0:
+        return []
+
+    cutoff = add_months((today or date.today()).replace(day=1), -retention_months)
+    archived = []
+
+    for name in list_partitions(conn, table_name):
+        month = parse_partition_month(table_name, name)
+        if month is None or add_months(month, 1) > cutoff:
+            continue
+
+        conn.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {name}"))
+        if drop:
+            conn.execute(text(f"DROP TABLE {name}"))
+            archived.append((name, "dropped"))
+        else:
+            schema = settings.PARTITION_ARCHIVE_SCHEMA
+            conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {schema}"))
+            conn.execute(text(f"ALTER TABLE {name} SET SCHEMA {schema}"))
+            archived.append((name, f"moved to {schema}"))
+
+    if archived:
+        logger.info(f"Archived {len(archived)} partition(s) of {table_name}")
+    return archived
+
+def create_partitioned_tables(conn):
+    """Create all tables, using range partitioning for PARTITIONED_TABLES"""
+    regular = [table for table in Base.metadata.sorted_tables if table.name not in PARTITIONED_TABLES]
+    Base.metadata.create_all(bind=conn, tables=regular)
+
+    for table_name in PARTITIONED_TABLES:
+        create_partitioned_table(conn, table_name)
+        ensure_partitions(conn, table_name)
+
+def maintain_partitions(conn):
+    """Periodic maintenance: pre-create upcoming partitions and archive expired ones"""
+    if not is_partitioning_enabled(conn.dialect.name):
+        return
+
+    # Wait for any other maintainer first; lock_timeout below only bounds the DDL
+    lock_maintenance(conn)
+    # ATTACH/DETACH wait on long-running readers; fail fast instead of queueing behind them
+    conn.execute(text(f"SET LOCAL lock_timeout = '{settings.PARTITION_LOCK_TIMEOUT}'"))
+    for table_name in PARTITIONED_TABLES:
+        if not _table_exists(conn, table_name):
+            continue
+        ensure_partitions(conn, table_name)
+        archive_partitions(conn, table_name)
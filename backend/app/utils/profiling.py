@@ -0,0 +1,194 @@
+"""
+Opt-in request profiling
+
+Sampled requests (PROFILING_SAMPLE_RATE, or `X-Profile: <PROFILING_TOKEN>`) get a
+wall/SQL/serialization breakdown and, when PROFILING_CPROFILE is on, a cProfile
+capture. Recent profiles are kept in memory and served from /admin/profiles.
+
+cProfile hooks the event loop thread, so at most one request is captured at a
+time (other sampled requests still get the timing breakdown), coroutines of
+concurrent requests interleaved on the loop appear in it too, and sync work moved
+to the threadpool shows up only as time spent waiting on it.
+"""
+import cProfile
+import io
+import itertools
+import marshal
+import pstats
+import random
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+from sqlalchemy import event
+from app.config import settings
+
+PROFILE_HEADER = b"x-profile"
+
+@dataclass
+class RequestProfile:
+    """Timing breakdown of one profiled request (seconds)"""
+    id: int
+    method: str
+    path: str
+    started_at: float
+    status: Optional[int] = None
+    wall: float = 0.0
+    sql: float = 0.0
+    sql_statements: int = 0
+    serialization: float = 0.0
+    stats: Optional[bytes] = None  # marshalled pstats data
+    _sql_starts: List[float] = field(default_factory=list, repr=False)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "started_at": self.started_at,
+            "wall_ms": round(self.wall * 1000, 3),
+            "sql_ms": round(self.sql * 1000, 3),
+            "sql_statements": self.sql_statements,
+            "serialization_ms": round(self.serialization * 1000, 3),
+            "other_ms": round(max(self.wall - self.sql - self.serialization, 0.0) * 1000, 3),
+            "has_cprofile": self.stats is not None,
+        }
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+class ProfileStore:
+    """The most recent profiles, oldest evicted first"""
+
+    def __init__(self, max_profiles: int):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[int, RequestProfile]" = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, profile: RequestProfile):
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: int) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> List[RequestProfile]:
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+STORE = ProfileStore(settings.PROFILING_MAX_PROFILES)
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Attribute the block to serialization time of the current profiled request"""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.serialization += time.perf_counter() - start
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is not None:
+        profile._sql_starts.append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    if profile is not None and profile._sql_starts:
+        profile.sql += time.perf_counter() - profile._sql_starts.pop()
+        profile.sql_statements += 1
+
+def instrument_engine(sync_engine):
+    """Count statement time of profiled requests (pass async_engine.sync_engine for async)"""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return sync_engine
+
+def render_stats(profile: RequestProfile, sort: str = "cumulative", limit: int = 60) -> str:
+    """Text report of a captured cProfile"""
+    stats = pstats.Stats(_StatsSource(profile.stats), stream=io.StringIO())
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return stats.stream.getvalue()
+
+class _StatsSource:
+    """Feeds marshalled stats back into pstats.Stats (which loads from a profiler or a file)"""
+
+    def __init__(self, data: bytes):
+        self.stats = marshal.loads(data)
+
+    def create_stats(self):
+        pass
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling a sample of requests. Wall time runs until the last
+    body chunk is sent, so streamed responses are measured in full.
+    """
+
+    def __init__(self, app, sample_rate: float = None, token: str = None, use_cprofile: bool = None,
+                 store: ProfileStore = None):
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.token = (settings.PROFILING_TOKEN if token is None else token).encode()
+        self.use_cprofile = settings.PROFILING_CPROFILE if use_cprofile is None else use_cprofile
+        self.store = store or STORE
+        self._cprofile_busy = threading.Lock()
+
+    def _wants_profile(self, scope) -> bool:
+        if self.token:
+            for name, value in scope.get("headers", ()):
+                if name == PROFILE_HEADER and value == self.token:
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(
+            id=self.store.next_id(), method=scope["method"], path=scope["path"], started_at=time.time()
+        )
+        profiler = None
+        if self.use_cprofile and self._cprofile_busy.acquire(blocking=False):
+            profiler = cProfile.Profile()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                message["headers"] = [*message.get("headers", ()), (b"x-profile-id", str(profile.id).encode())]
+            await send(message)
+
+        token = _current.set(profile)
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self._cprofile_busy.release()
+                profiler.create_stats()
+                profile.stats = marshal.dumps(profiler.stats)
+            profile.wall = time.perf_counter() - start
+            _current.reset(token)
+            self.store.add(profile)
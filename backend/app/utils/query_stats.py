@@ -0,0 +1,184 @@
+"""
+SQL query instrumentation
+
+Engine cursor events feed the QueryStats bound to the current request (or to a
+`capture_queries()` block in scripts): statement count, SQL time, the slowest
+statements with their parameters, and identical statements repeated within one
+request — the N+1 pattern of e.g. lazy `Profile.videos` loads. Statements slower
+than SQL_EXPLAIN_MS get their query plan attached.
+"""
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import event
+from app.config import settings
+from app.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+# Plan prefix per dialect (others are not explained)
+EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+}
+MAX_PARAMETERS_REPR = 300
+
+@dataclass
+class Statement:
+    """One executed statement (duration in seconds)"""
+    sql: str
+    parameters: str
+    duration: float
+    plan: Optional[str] = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "sql": self.sql,
+            "parameters": self.parameters,
+            "duration_ms": round(self.duration * 1000, 3),
+            "plan": self.plan,
+        }
+
+class QueryStats:
+    """Statements executed within one request or capture block"""
+
+    def __init__(self, slowest_kept: int = None, repeat_threshold: int = None):
+        self.slowest_kept = settings.SQL_SLOWEST_KEPT if slowest_kept is None else slowest_kept
+        self.repeat_threshold = settings.SQL_REPEAT_THRESHOLD if repeat_threshold is None else repeat_threshold
+        self.count = 0
+        self.total = 0.0
+        self.by_sql: Counter = Counter()
+        self._slowest: List[Tuple[float, int, Statement]] = []  # min-heap of the slowest kept
+        self._seq = itertools.count()
+
+    def record(self, statement: Statement):
+        self.count += 1
+        self.total += statement.duration
+        self.by_sql[statement.sql] += 1
+        if self.slowest_kept <= 0:
+            return
+        item = (statement.duration, next(self._seq), statement)
+        if len(self._slowest) < self.slowest_kept:
+            heapq.heappush(self._slowest, item)
+        else:
+            heapq.heappushpop(self._slowest, item)
+
+    @property
+    def slowest(self) -> List[Statement]:
+        return [item[2] for item in sorted(self._slowest, reverse=True)]
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """Statements executed at least repeat_threshold times (likely N+1), most frequent first"""
+        if self.repeat_threshold <= 0:
+            return []
+        return [(sql, count) for sql, count in self.by_sql.most_common() if count >= self.repeat_threshold]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "statements": self.count,
+            "sql_ms": round(self.total * 1000, 3),
+            "slowest": [statement.summary() for statement in self.slowest],
+            "repeated": [{"sql": sql, "count": count} for sql, count in self.repeated()],
+        }
+
+# Active collectors, innermost last (a script's capture block also sees the middleware's requests)
+_current: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+@contextmanager
+def capture_queries(**kwargs) -> Iterator[QueryStats]:
+    """Collect statements executed in this block (engine must be instrumented)"""
+    stats = QueryStats(**kwargs)
+    token = _current.set(_current.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+def _format_parameters(parameters) -> str:
+    text = repr(parameters)
+    return text if len(text) <= MAX_PARAMETERS_REPR else text[:MAX_PARAMETERS_REPR] + "..."
+
+def _explain(conn, statement: str, parameters) -> Optional[str]:
+    """Query plan through a separate DBAPI cursor on the same connection (bypasses engine events)"""
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if prefix is None:
+        return None
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(" ".join(str(value) for value in row) for row in cursor.fetchall())
+    except Exception as e:
+        return f"EXPLAIN failed: {e}"
+    finally:
+        cursor.close()
+
+def _should_explain(statement: str, duration: float, context, executemany: bool) -> bool:
+    if settings.SQL_EXPLAIN_MS <= 0 or duration * 1000 < settings.SQL_EXPLAIN_MS or executemany:
+        return False
+    # Server-side cursors are still open on the connection until the rows are consumed
+    if context is not None and context.execution_options.get("stream_results"):
+        return False
+    return statement.lstrip()[:6].upper() in ("SELECT", "WITH")
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get():
+        conn.info.setdefault("query_stats_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _current.get()
+    starts = conn.info.get("query_stats_start")
+    if not collectors or not starts:
+        return
+    duration = time.perf_counter() - starts.pop()
+    plan = _explain(conn, statement, parameters) if _should_explain(statement, duration, context, executemany) else None
+    recorded = Statement(statement, _format_parameters(parameters), duration, plan)
+    for stats in collectors:
+        stats.record(recorded)
+
+def instrument_engine(sync_engine):
+    """Attach the collectors to an engine (pass async_engine.sync_engine for async)"""
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return sync_engine
+
+def report(stats: QueryStats, label: str):
+    """Record metrics for a finished request and log slow statements and N+1 patterns"""
+    metrics.SQL_STATEMENTS_PER_REQUEST.observe(stats.count)
+    metrics.SQL_SECONDS_PER_REQUEST.observe(stats.total)
+    repeated = stats.repeated()
+    if repeated:
+        metrics.SQL_REPEATED_REQUESTS.inc()
+        for sql, count in repeated:
+            logger.warning(f"{label}: statement repeated {count}x (possible N+1): {sql}")
+    for statement in stats.slowest:
+        if statement.duration * 1000 < settings.SQL_SLOW_QUERY_MS:
+            break
+        metrics.SQL_SLOW_STATEMENTS.inc()
+        message = f"{label}: slow statement {statement.duration * 1000:.1f}ms: {statement.sql} {statement.parameters}"
+        if statement.plan:
+            message += f"\n{statement.plan}"
+        logger.warning(message)
+    logger.debug(f"{label}: {stats.count} statements in {stats.total * 1000:.1f}ms")
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting QueryStats per HTTP request, including streamed bodies"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with capture_queries() as stats:
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                report(stats, f"{scope['method']} {scope['path']}")
@@ -0,0 +1,99 @@
+"""
+Token-bucket rate limiting for outbound API calls
+
+The in-process bucket limits one worker; with REDIS_URL set the bucket lives in
+Redis and is shared by every worker and host using the same key, so the combined
+request rate stays under the upstream quota.
+"""
+import threading
+import time
+from typing import Optional
+from app.config import settings
+from app.utils import metrics
+
+try:
+    import redis
+except ImportError:  # Optional: only needed when REDIS_URL is set
+    redis = None
+
+class RateLimitTimeout(Exception):
+    """No token became available within the wait limit"""
+
+class TokenBucket:
+    """`rate` tokens per second refill a bucket holding at most `capacity` (the burst size)"""
+
+    def __init__(self, name: str, rate: float, capacity: float):
+        self.name = name
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is available; otherwise seconds until one will be"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> float:
+        """Block until a token is taken; returns seconds waited"""
+        if self.rate <= 0:
+            return 0.0
+        start = time.monotonic()
+        while True:
+            wait = self._reserve()
+            waited = time.monotonic() - start
+            if wait <= 0:
+                metrics.RATE_LIMIT_WAIT_SECONDS.labels(limiter=self.name).observe(waited)
+                return waited
+            if timeout is not None and waited + wait > timeout:
+                raise RateLimitTimeout(f"{self.name}: no token within {timeout}s")
+            time.sleep(wait)
+
+class RedisTokenBucket(TokenBucket):
+    """Same bucket stored in a Redis hash and updated atomically by a Lua script"""
+
+    # Returns 0 when a token was taken, else milliseconds until one is available.
+    # Uses the Redis clock so workers on different hosts agree on refill time.
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local now_parts = redis.call('TIME')
+    local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = math.ceil((1 - tokens) / rate * 1000)
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+    return wait
+    """
+
+    def __init__(self, name: str, rate: float, capacity: float, redis_url: str, prefix: str = "pocket:ratelimit:"):
+        super().__init__(name, rate, capacity)
+        if redis is None:
+            raise RuntimeError("redis package is not installed (pip install redis)")
+        self.client = redis.Redis.from_url(redis_url)
+        self.key = prefix + name
+        self._script = self.client.register_script(self.SCRIPT)
+
+    def _reserve(self) -> float:
+        return int(self._script(keys=[self.key], args=[self.rate, self.capacity])) / 1000
+
+def create_bucket(name: str, rate: float, capacity: float) -> TokenBucket:
+    """Redis-backed bucket when REDIS_URL is set, in-process otherwise"""
+    if settings.REDIS_URL:
+        return RedisTokenBucket(name, rate, capacity, settings.REDIS_URL)
+    return TokenBucket(name, rate, capacity)
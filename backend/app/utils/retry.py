@@ -0,0 +1,73 @@
+"""
+Retry with exponential backoff and full jitter for outbound HTTP calls
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+import requests
+from app.config import settings
+from app.utils import metrics
+from app.utils.rate_limit import TokenBucket
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# A POST may have been processed when it failed, so it is only retried when it certainly was not
+UNPROCESSED_STATUSES = {429, 503}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+MAX_RETRY_AFTER = 300  # seconds; longer server hints are capped
+
+def backoff_delay(attempt: int, base: float = None, cap: float = None) -> float:
+    """Full jitter: uniform in [0, min(cap, base * 2^attempt)]"""
+    base = settings.RETRY_BACKOFF_BASE if base is None else base
+    cap = settings.RETRY_BACKOFF_MAX if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Retry-After header as seconds (delta-seconds or HTTP date), if present"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def request_with_retry(method: str, url: str, target: str, bucket: TokenBucket = None,
+                       max_retries: int = None, **kwargs) -> requests.Response:
+    """
+    Send a request, taking a rate-limit token before every attempt and retrying
+    timeouts, connection errors, 429 and 5xx up to max_retries times (non-idempotent
+    methods only on connect timeouts, 429 and 503). The last response (or exception)
+    is returned (or raised) once retries are exhausted.
+    """
+    max_retries = settings.MAX_RETRIES if max_retries is None else max_retries
+    kwargs.setdefault("timeout", settings.OUTBOUND_TIMEOUT)
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    retry_errors = (requests.Timeout, requests.ConnectionError) if idempotent else (requests.ConnectTimeout,)
+    retry_statuses = RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES
+    attempt = 0
+    while True:
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            response = requests.request(method, url, **kwargs)
+        except retry_errors as e:
+            if attempt >= max_retries:
+                raise
+            reason, delay = type(e).__name__, backoff_delay(attempt)
+        else:
+            if response.status_code not in retry_statuses or attempt >= max_retries:
+                return response
+            # Honour the server's Retry-After, but never wait less than the backoff
+            reason = str(response.status_code)
+            retry_after = min(retry_after_seconds(response) or 0.0, MAX_RETRY_AFTER)
+            delay = max(retry_after, backoff_delay(attempt))
+
+        metrics.OUTBOUND_RETRIES.labels(target=target, reason=reason).inc()
+        print(f"🔁 {target}: {reason}, retry {attempt + 1}/{max_retries} in {delay:.1f}s")
+        time.sleep(delay)
+        attempt += 1
@@ -0,0 +1,78 @@
+"""
+Fast JSON serialization for large list responses
+
+List endpoints select plain rows with Core and serialize them with orjson, skipping
+ORM object construction and per-item Pydantic validation of trusted DB output.
+Routes keep their `response_model` so the OpenAPI schema is unchanged.
+"""
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Type
+import orjson
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel
+from app.config import settings
+from app.utils.database import AsyncSessionLocal
+from app.utils.profiling import timed_serialization
+
+# Naive datetimes render like Pydantic (ISO 8601), aware UTC ones with a "Z" suffix
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes with orjson"""
+    with timed_serialization():
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+class ORJSONResponse(Response):
+    """JSON response rendered with orjson"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def schema_columns(schema: Type[BaseModel], table, fields: Optional[Sequence[str]] = None) -> list:
+    """Table columns backing the fields of a response schema, in schema field order"""
+    return [
+        table.c[name] for name in schema.model_fields
+        if name in table.c and (fields is None or name in fields)
+    ]
+
+def should_stream(limit: int) -> bool:
+    """Large pages are streamed as a JSON array instead of rendered in one buffer"""
+    return 0 < settings.JSON_STREAM_MIN_ITEMS <= limit
+
+def list_response(key: str, items: List[Dict[str, Any]], total: int, page: int, size: int) -> ORJSONResponse:
+    """Render a `{key: [...], total, page, size}` list payload"""
+    return ORJSONResponse({key: items, "total": total, "page": page, "size": size})
+
+def stream_list_response(key: str, chunks: AsyncIterator[List[Dict[str, Any]]],
+                         total: int, page: int, size: int) -> StreamingResponse:
+    """Stream a `{key: [...], total, page, size}` list payload chunk by chunk"""
+    async def body():
+        yield b'{"' + key.encode() + b'":['
+        first = True
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            if not first:
+                yield b","
+            # Strip the enclosing brackets so chunks join into one array
+            yield dumps(chunk)[1:-1]
+            first = False
+        yield b"]," + dumps({"total": total, "page": page, "size": size})[1:]
+
+    return StreamingResponse(body(), media_type="application/json")
+
+async def stream_rows(statement, enrich: Optional[Callable[[Any, List[dict]], Awaitable[None]]] = None,
+                      chunk_size: Optional[int] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Yield result rows of `statement` as lists of dicts, fetched from a server-side cursor
+    in its own session (the request session may be closed while the body is streamed).
+    `enrich(session, rows)` can add nested data to each chunk using a second session.
+    """
+    chunk_size = chunk_size or settings.JSON_STREAM_CHUNK_SIZE
+    async with AsyncSessionLocal() as db, AsyncSessionLocal() as lookup:
+        result = await db.stream(statement)
+        async for partition in result.mappings().partitions(chunk_size):
+            rows = [dict(row) for row in partition]
+            if enrich is not None:
+                await enrich(lookup, rows)
+            yield rows
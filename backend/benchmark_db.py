@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark for the database engine tuning profile
+
+Runs reader threads (API-style list/aggregate queries) against writer threads
+(scraper-style inserts and updates) and reports throughput, latency and lock errors.
+
+Usage:
+    python benchmark_db.py --database-url sqlite:///./bench.db --journal-mode DELETE
+    python benchmark_db.py --database-url sqlite:///./bench.db --journal-mode WAL
+"""
+import argparse
+import os
+import statistics
+import threading
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark mixed read/write database load')
+    parser.add_argument('--database-url', default='sqlite:///./benchmark_db.db', help='Database to benchmark (will be written to)')
+    parser.add_argument('--journal-mode', help='Override SQLITE_JOURNAL_MODE (e.g. WAL, DELETE)')
+    parser.add_argument('--synchronous', help='Override SQLITE_SYNCHRONOUS (e.g. NORMAL, FULL)')
+    parser.add_argument('--readers', type=int, default=8, help='Number of reader threads')
+    parser.add_argument('--writers', type=int, default=2, help='Number of writer threads')
+    parser.add_argument('--seed-rows', type=int, default=5000, help='Videos inserted before the run')
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds to run')
+    return parser.parse_args()
+
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (milliseconds)"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index] * 1000
+
+
+def main():
+    args = parse_args()
+
+    # Settings are read at import time, so configure the profile before importing the app
+    os.environ['DATABASE_URL'] = args.database_url
+    if args.journal_mode:
+        os.environ['SQLITE_JOURNAL_MODE'] = args.journal_mode
+    if args.synchronous:
+        os.environ['SQLITE_SYNCHRONOUS'] = args.synchronous
+
+    from sqlalchemy import select, func, update
+    from sqlalchemy.exc import OperationalError
+    from app.config import settings
+    from app.utils.database import Base, SessionLocal, engine
+    from app.models.video import Video
+    from app.models import profile  # noqa: F401 - register Profile for the relationship
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with SessionLocal() as db:
+        db.add_all(
+            Video(url=f"https://www.instagram.com/p/seed{i}/", username=f"@user{i % 50}",
+                  likes=i, comments=i // 10, views=i * 10, likes_rate=10.0, comments_rate=1.0)
+            for i in range(args.seed_rows)
+        )
+        db.commit()
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'read': [], 'write': [], 'errors': 0}
+
+    def record(kind, elapsed):
+        with lock:
+            results[kind].append(elapsed)
+
+    def reader(worker_id):
+        offset = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with SessionLocal() as db:
+                    db.execute(select(Video).offset(offset).limit(100)).scalars().all()
+                    db.execute(select(func.avg(Video.likes_rate), func.count(Video.id))).first()
+                record('read', time.perf_counter() - start)
+            except OperationalError:
+                with lock:
+                    results['errors'] += 1
+            offset = (offset + 100) % args.seed_rows
+
+    def writer(worker_id):
+        counter = 0
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                with SessionLocal() as db:
+                    db.add(Video(url=f"https://www.instagram.com/p/w{worker_id}-{counter}/", username="@writer",
+                                 likes=counter, views=counter * 10))
+                    db.execute(update(Video).where(Video.id == (counter % args.seed_rows) + 1).values(likes=counter))
+                    db.commit()
+                record('write', time.perf_counter() - start)
+            except OperationalError:
+                with lock:
+                    results['errors'] += 1
+            counter += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(args.writers)]
+
+    print(f"🚀 Benchmarking {engine.url.render_as_string(hide_password=True)}")
+    if engine.dialect.name == 'sqlite':
+        print(f"   journal_mode={settings.SQLITE_JOURNAL_MODE} synchronous={settings.SQLITE_SYNCHRONOUS} "
+              f"busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}ms")
+    else:
+        print(f"   pool_size={settings.DB_POOL_SIZE} max_overflow={settings.DB_MAX_OVERFLOW}")
+    print(f"   {args.readers} readers, {args.writers} writers, {args.duration:.0f}s")
+
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    print("\n📊 Results:")
+    for kind in ('read', 'write'):
+        samples = results[kind]
+        mean_ms = statistics.mean(samples) * 1000 if samples else 0.0
+        print(f"   {kind:<5} {len(samples) / args.duration:>9.1f} ops/s  "
+              f"mean {mean_ms:7.2f}ms  p95 {percentile(samples, 95):7.2f}ms  p99 {percentile(samples, 99):7.2f}ms")
+    print(f"   lock/timeout errors: {results['errors']}")
+
+
+if __name__ == "__main__":
+    main()
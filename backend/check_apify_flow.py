@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+End-to-end check of Apify run completion against fake_apify.py
+
+Starts the fake Apify API and this backend (uvicorn, for the webhook callback) on
+local ports, then scrapes one URL with polling only, with webhooks, and with
+webhooks dropped (polling fallback), reporting latency and status polls per mode.
+
+Usage:
+    python check_apify_flow.py
+    python check_apify_flow.py --run-seconds 5 --rate-limit-every 4
+"""
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Check webhook and polling run completion against a fake Apify')
+    parser.add_argument('--run-seconds', type=float, default=3.0, help='Seconds each fake run takes')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Fake Apify answers every Nth request with 429')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    backend_port = free_port()
+
+    # Settings are read at import time, so configure them before importing the app
+    os.environ.setdefault('DATABASE_URL', 'sqlite:///./apify_flow.db')
+    # The webhook router is only mounted when URL and secret are set at startup
+    webhook_url = f"http://127.0.0.1:{backend_port}/api/v1/apify/webhook"
+    os.environ['APIFY_WEBHOOK_URL'] = webhook_url
+    os.environ['APIFY_WEBHOOK_SECRET'] = 'check-apify-flow'
+    os.environ['RETRY_BACKOFF_BASE'] = '0.2'
+    os.environ.setdefault('APIFY_POLL_MAX_INTERVAL', '5')
+
+    import uvicorn
+    from fake_apify import FakeApify
+    from app.config import settings
+    from app.main import app
+    from app.services.instagram_scraper import InstagramScraper
+
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=backend_port, log_level='warning'))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    modes = [
+        ('polling', '', False),
+        ('webhook', webhook_url, False),
+        ('webhook dropped (fallback)', webhook_url, True),
+    ]
+
+    failures = 0
+    print(f"🧪 Fake Apify runs take {args.run_seconds}s")
+    for name, callback, drop in modes:
+        fake = FakeApify(run_seconds=args.run_seconds, drop_webhooks=drop,
+                         rate_limit_every=args.rate_limit_every).start()
+        settings.APIFY_API_URL = fake.api_url
+        settings.APIFY_WEBHOOK_URL = callback
+        start = time.perf_counter()
+        data = InstagramScraper().scrape_video_data('https://www.instagram.com/reel/check/')
+        elapsed = time.perf_counter() - start
+        fake.stop()
+
+        ok = data is not None and data['username'] == '@fake_creator'
+        failures += not ok
+        print(f"   {'✅' if ok else '❌'} {name:<28} {elapsed:6.2f}s  "
+              f"(+{elapsed - args.run_seconds:5.2f}s over run)  status polls: {fake.stats['status_polls']}  "
+              f"webhooks: {fake.stats['webhooks_sent']}  429s: {fake.stats['rate_limited']}")
+
+    server.should_exit = True
+    print(f"\n{'✅ All modes completed' if not failures else f'❌ {failures} mode(s) failed'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
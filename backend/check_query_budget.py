@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+SQL statement budget check for the read endpoints
+
+Seeds a scratch SQLite database, calls each endpoint through the ASGI app and fails
+when it executes more statements than its budget or repeats an identical statement
+(N+1). Run it before merging changes to routers or models.
+
+Usage:
+    python check_query_budget.py
+    python check_query_budget.py --profiles 50 --videos-per-profile 20 -v
+"""
+import argparse
+import os
+import sys
+
+# Endpoint -> maximum statements per request (independent of the number of rows)
+BUDGETS = {
+    "/api/v1/videos/?limit=100": 2,
+    "/api/v1/videos/1": 1,
+    "/api/v1/profiles/?limit=100": 3,
+    "/api/v1/profiles/?limit=100&fields=id,username,videos": 3,
+    "/api/v1/profiles/1": 2,
+    "/api/v1/profiles/username/user1": 2,
+    "/api/v1/analytics/engagement-stats": 1,
+    "/api/v1/analytics/top-performers": 1,
+    "/api/v1/analytics/outliers": 2,
+    "/api/v1/analytics/profile-stats/user1": 2,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Check per-endpoint SQL statement budgets')
+    parser.add_argument('--database-url', default='sqlite:///./query_budget.db', help='Scratch database (will be recreated)')
+    parser.add_argument('--profiles', type=int, default=20, help='Profiles to seed')
+    parser.add_argument('--videos-per-profile', type=int, default=10, help='Videos to seed per profile')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print every statement of each endpoint')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Settings are read at import time, so configure them before importing the app
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['SQL_INSTRUMENTATION'] = 'true'
+    os.environ['SQL_REPEAT_THRESHOLD'] = '3'
+    os.environ['JSON_STREAM_MIN_ITEMS'] = '0'
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.models.profile import Profile
+    from app.models.video import Video
+    from app.utils.database import Base, SessionLocal, engine
+    from app.utils.query_stats import capture_queries
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        profiles = [Profile(username=f"user{i}", followers_count=i * 100) for i in range(1, args.profiles + 1)]
+        db.add_all(profiles)
+        db.flush()
+        db.add_all(
+            Video(url=f"https://www.instagram.com/p/{profile.id}-{n}/", username=profile.username,
+                  profile_id=profile.id, likes=n * 10, comments=n, views=n * 100 + 1,
+                  likes_rate=10.0 + n, comments_rate=1.0)
+            for profile in profiles for n in range(args.videos_per_profile)
+        )
+        db.commit()
+
+    failures = 0
+    print(f"🔎 Checking SQL budgets ({args.profiles} profiles x {args.videos_per_profile} videos)")
+    with TestClient(app) as client:
+        for path, budget in BUDGETS.items():
+            with capture_queries() as stats:
+                response = client.get(path)
+            repeated = stats.repeated()
+            ok = response.status_code == 200 and stats.count <= budget and not repeated
+            failures += not ok
+            print(f"   {'✅' if ok else '❌'} {path:<58} {stats.count:>3}/{budget} statements "
+                  f"{stats.total * 1000:7.2f}ms  HTTP {response.status_code}")
+            for sql, count in repeated:
+                print(f"      repeated {count}x: {' '.join(sql.split())[:120]}")
+            if args.verbose:
+                for statement in stats.slowest:
+                    print(f"      {statement.duration * 1000:7.2f}ms {' '.join(statement.sql.split())[:120]}")
+
+    print(f"\n{'✅ All endpoints within budget' if not failures else f'❌ {failures} endpoint(s) over budget'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+API startup benchmark and import budget check
+
+Imports the FastAPI app in fresh interpreters, reports the median import time and
+the slowest modules (from -X importtime), and fails when startup exceeds the
+budget or when heavy ML modules are imported before the first transcription.
+
+Usage:
+    python check_startup.py
+    python check_startup.py --runs 10 --budget 0.5 --top 20
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Must stay out of API startup (loaded lazily by app.services.transcription)
+FORBIDDEN_MODULES = ['whisper', 'torch', 'numpy']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(m for m in sys.modules if "." not in m)}))
+"""
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark API import time and check the import budget')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time')
+    parser.add_argument('--budget', type=float, default=1.0, help='Maximum median import time in seconds')
+    parser.add_argument('--top', type=int, default=10, help='Slowest imports to list')
+    return parser.parse_args()
+
+
+def run_probe(importtime: bool = False):
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', PROBE]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise SystemExit(f"❌ Importing app.main failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def slowest_imports(importtime_log: str, top: int):
+    """(cumulative seconds, module) of the modules with the largest cumulative import time"""
+    entries = []
+    for line in importtime_log.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line.split(':', 1)[1].split('|', 2)
+        entries.append((int(cumulative_us) / 1e6, name.strip()))
+    return sorted(entries, reverse=True)[:top]
+
+
+def main():
+    args = parse_args()
+    print(f"⏱️  Importing app.main in {args.runs} fresh interpreter(s)")
+
+    timings = []
+    modules = []
+    for _ in range(args.runs):
+        probe, _ = run_probe()
+        timings.append(probe['seconds'])
+        modules = probe['modules']
+    median = statistics.median(timings)
+    print(f"   median {median * 1000:.0f}ms  min {min(timings) * 1000:.0f}ms  max {max(timings) * 1000:.0f}ms")
+
+    _, importtime_log = run_probe(importtime=True)
+    print("\n🐢 Slowest imports (cumulative):")
+    for seconds, name in slowest_imports(importtime_log, args.top):
+        print(f"   {seconds * 1000:8.1f}ms  {name}")
+
+    failures = []
+    loaded = [name for name in FORBIDDEN_MODULES if name in modules]
+    if loaded:
+        failures.append(f"heavy modules imported at startup: {', '.join(loaded)}")
+    if median > args.budget:
+        failures.append(f"median import time {median:.2f}s exceeds budget {args.budget:.2f}s")
+
+    for failure in failures:
+        print(f"\n❌ {failure}")
+    if not failures:
+        print(f"\n✅ Startup within budget ({median:.2f}s <= {args.budget:.2f}s, no {'/'.join(FORBIDDEN_MODULES)})")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Apify API (run start, run status, dataset items, webhooks)
+
+Runs finish after --run-seconds; ad-hoc webhooks passed in the `webhooks` query
+parameter are then called like Apify does. Point the backend at it with
+APIFY_API_URL=http://127.0.0.1:<port>/v2.
+
+Usage:
+    python fake_apify.py --port 8765 --run-seconds 3
+    python fake_apify.py --drop-webhooks          # exercise the polling fallback
+    python fake_apify.py --rate-limit-every 3     # every 3rd request gets 429
+"""
+import argparse
+import base64
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import requests
+
+RUN_START = re.compile(r"^/v2/acts/(?P<actor>[^/]+)/runs$")
+RUN_STATUS = re.compile(r"^/v2/actor-runs/(?P<run_id>[^/]+)$")
+RUN_ITEMS = re.compile(r"^/v2/actor-runs/(?P<run_id>[^/]+)/dataset/items$")
+
+
+class FakeApify:
+    """Threaded HTTP server keeping runs in memory"""
+
+    def __init__(self, port: int = 0, run_seconds: float = 3.0, final_status: str = "SUCCEEDED",
+                 drop_webhooks: bool = False, rate_limit_every: int = 0):
+        self.run_seconds = run_seconds
+        self.final_status = final_status
+        self.drop_webhooks = drop_webhooks
+        self.rate_limit_every = rate_limit_every
+        self.runs = {}
+        self.stats = {'requests': 0, 'status_polls': 0, 'webhooks_sent': 0, 'rate_limited': 0}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self.port = self.server.server_address[1]
+        self.api_url = f"http://127.0.0.1:{self.port}/v2"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _finish(self, run_id: str, webhooks: list):
+        run = self.runs[run_id]
+        run['status'] = self.final_status
+        run['finishedAt'] = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+        if self.drop_webhooks:
+            return
+        event_type = 'ACTOR.RUN.' + self.final_status.replace('-', '_')
+        for webhook in webhooks:
+            if event_type not in webhook.get('eventTypes', []):
+                continue
+            payload = {
+                'eventType': event_type,
+                'eventData': {'actorId': run['actId'], 'actorRunId': run_id},
+                'resource': run,
+            }
+            try:
+                requests.post(webhook['requestUrl'], json=payload, timeout=10)
+                with self._lock:
+                    self.stats['webhooks_sent'] += 1
+            except requests.RequestException as e:
+                print(f"⚠️ Webhook to {webhook['requestUrl']} failed: {e}")
+
+    def _start_run(self, actor: str, query: dict, body: dict) -> dict:
+        run_id = f"run{next(self._ids)}"
+        webhooks = []
+        if 'webhooks' in query:
+            webhooks = json.loads(base64.b64decode(query['webhooks'][0]))
+        self.runs[run_id] = {
+            'id': run_id, 'actId': actor, 'status': 'RUNNING',
+            'defaultDatasetId': f"dataset-{run_id}", 'input': body,
+        }
+        threading.Timer(self.run_seconds, self._finish, args=(run_id, webhooks)).start()
+        return self.runs[run_id]
+
+    def _items(self, run_id: str) -> list:
+        url = (self.runs[run_id].get('input') or {}).get('directUrls', [''])[0]
+        return [{
+            'url': url, 'ownerUsername': 'fake_creator', 'likesCount': 1200,
+            'commentsCount': 45, 'videoViewCount': 30000, 'timestamp': '2024-05-01T12:00:00.000Z',
+        }]
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body=None, headers: dict = None):
+                data = json.dumps(body).encode() if body is not None else b''
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _rate_limited(self) -> bool:
+                with fake._lock:
+                    fake.stats['requests'] += 1
+                    limited = fake.rate_limit_every and fake.stats['requests'] % fake.rate_limit_every == 0
+                    if limited:
+                        fake.stats['rate_limited'] += 1
+                if limited:
+                    self._send(429, {'error': {'type': 'rate-limit-exceeded'}}, {'Retry-After': '1'})
+                return bool(limited)
+
+            def do_POST(self):
+                if self._rate_limited():
+                    return
+                url = urlparse(self.path)
+                match = RUN_START.match(url.path)
+                if not match:
+                    return self._send(404, {'error': {'type': 'page-not-found'}})
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                self._send(201, {'data': fake._start_run(match['actor'], parse_qs(url.query), body)})
+
+            def do_GET(self):
+                if self._rate_limited():
+                    return
+                path = urlparse(self.path).path
+                match = RUN_ITEMS.match(path)
+                if match and match['run_id'] in fake.runs:
+                    return self._send(200, fake._items(match['run_id']))
+                match = RUN_STATUS.match(path)
+                if match and match['run_id'] in fake.runs:
+                    with fake._lock:
+                        fake.stats['status_polls'] += 1
+                    return self._send(200, {'data': fake.runs[match['run_id']]})
+                self._send(404, {'error': {'type': 'record-not-found'}})
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Apify run and webhook API')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--run-seconds', type=float, default=3.0, help='Seconds until a run finishes')
+    parser.add_argument('--final-status', default='SUCCEEDED', choices=['SUCCEEDED', 'FAILED', 'TIMED-OUT', 'ABORTED'])
+    parser.add_argument('--drop-webhooks', action='store_true', help='Never call webhooks (polling fallback)')
+    parser.add_argument('--rate-limit-every', type=int, default=0, help='Answer every Nth request with 429')
+    args = parser.parse_args()
+
+    fake = FakeApify(args.port, args.run_seconds, args.final_status, args.drop_webhooks, args.rate_limit_every)
+    print(f"🧪 Fake Apify on {fake.api_url} (runs take {args.run_seconds}s)")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n⏹️  Stopped: {fake.stats}")
+
+
+if __name__ == "__main__":
+    main()
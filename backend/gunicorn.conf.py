@@ -0,0 +1,32 @@
+"""
+Gunicorn settings for running the API with several uvicorn workers
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+With TRANSCRIPTION_MODE=preload the master imports the app and loads the Whisper
+model before forking, so workers share the weights copy-on-write instead of each
+loading a copy (uvicorn --workers spawns fresh interpreters and cannot share them).
+"""
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "900"))  # scrape requests wait on Apify and Whisper
+
+preload_app = os.getenv("TRANSCRIPTION_MODE", "local") == "preload"
+
+
+def when_ready(server):
+    if workers > 1 and os.getenv("APIFY_WEBHOOK_URL") and not os.getenv("REDIS_URL"):
+        server.log.warning("Apify webhooks without REDIS_URL reach the waiting worker only 1/%d of the time; "
+                           "the rest are picked up by status polling", workers)
+    if not preload_app:
+        return
+    from app.services.transcription import get_whisper_model
+    get_whisper_model()
+    # Move everything allocated so far out of the collector's generations, so GC passes
+    # in the workers don't write to (and un-share) the inherited object headers
+    gc.freeze()
+    server.log.info("Whisper model loaded in master; workers will share it copy-on-write")
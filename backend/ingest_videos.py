@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Upsert scraped posts (NDJSON, one post per line) into the videos table
+
+Usage:
+    python ingest_videos.py posts.ndjson
+    python ../scripts/scrape_posts.py cristiano | python ingest_videos.py
+
+Lines are consumed as they arrive and committed in batches, so a running
+scrape can be piped straight in.
+"""
+import argparse
+import json
+import sys
+from app.utils.database import SessionLocal
+from app.services.video_ingest import upsert_videos
+from app.models import video, profile  # Import models to register them
+
+
+def read_posts(stream):
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            post = json.loads(line)
+        except ValueError as e:
+            print(f"⚠️ Skipping line {line_number}: {e}", file=sys.stderr)
+            continue
+        if not post.get("url"):
+            print(f"⚠️ Skipping line {line_number}: no url", file=sys.stderr)
+            continue
+        yield post
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upsert NDJSON posts into the videos table')
+    parser.add_argument('input', nargs='?', type=argparse.FileType('r'), default=sys.stdin,
+                        help='NDJSON file (default: stdin)')
+    parser.add_argument('--batch-size', type=int, default=100)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = upsert_videos(db, read_posts(args.input), batch_size=args.batch_size)
+    finally:
+        db.close()
+
+    print(f"✅ {stats['inserted']} inserted, {stats['updated']} updated")
+
+
+if __name__ == "__main__":
+    main()
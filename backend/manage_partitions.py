@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Maintain monthly partitions of the videos table (PostgreSQL with DB_PARTITIONING=true)
+
+Usage:
+    python manage_partitions.py list
+    python manage_partitions.py ensure
+    python manage_partitions.py archive --retention-months 24 [--drop]
+    python manage_partitions.py maintain
+
+Run `maintain` (ensure + archive) from cron, e.g. daily, so upcoming months always have a
+partition; API workers never run this DDL. Concurrent runs queue on an advisory lock.
+"""
+import argparse
+import sys
+from app.config import settings
+from app.utils.database import engine
+from app.utils.partitioning import (
+    PARTITIONED_TABLES, archive_partitions, ensure_partitions, is_partitioning_enabled, list_partitions,
+    lock_maintenance, maintain_partitions
+)
+from app.models import video, profile  # Import models to register them
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Maintain monthly table partitions')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help='List attached partitions')
+    subparsers.add_parser('ensure', help='Create missing past/upcoming monthly partitions')
+    archive_parser = subparsers.add_parser('archive', help='Detach partitions older than the retention window')
+    archive_parser.add_argument('--retention-months', type=int, default=settings.PARTITION_RETENTION_MONTHS)
+    archive_parser.add_argument('--drop', action='store_true', help='Drop detached partitions instead of archiving')
+    subparsers.add_parser('maintain', help='ensure + archive with the configured retention (for cron)')
+    args = parser.parse_args()
+
+    if not is_partitioning_enabled(engine.dialect.name):
+        print("❌ Partitioning requires PostgreSQL and DB_PARTITIONING=true")
+        sys.exit(1)
+
+    with engine.begin() as conn:
+        if args.command == 'maintain':
+            maintain_partitions(conn)
+            print("✅ Partition maintenance complete")
+            return
+        if args.command != 'list':
+            lock_maintenance(conn)
+        for table_name in PARTITIONED_TABLES:
+            if args.command == 'list':
+                print(f"📋 {table_name}:")
+                for name in list_partitions(conn, table_name):
+                    print(f"   {name}")
+            elif args.command == 'ensure':
+                created = ensure_partitions(conn, table_name)
+                print(f"✅ {table_name}: {len(created)} partition(s) created")
+            elif args.command == 'archive':
+                archived = archive_partitions(conn, table_name, retention_months=args.retention_months, drop=args.drop)
+                for name, action in archived:
+                    print(f"🗄️ {name}: {action}")
+                print(f"✅ {table_name}: {len(archived)} partition(s) detached")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Per-process memory of a running API server (Linux)
+
+Reports RSS, PSS (shared pages split between the processes mapping them) and USS
+(private pages) for a master process and its workers. Compare the PSS total across
+TRANSCRIPTION_MODE=local, preload and ipc to see what sharing the model saves.
+
+Usage:
+    python memory_report.py <master_pid>
+    python memory_report.py <master_pid> <transcription_server_pid>
+"""
+import argparse
+import os
+import sys
+
+FIELDS = ('Rss', 'Pss', 'Private_Clean', 'Private_Dirty', 'Shared_Clean', 'Shared_Dirty')
+
+
+def read_memory(pid: int) -> dict:
+    """smaps_rollup totals in bytes"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup', 'r') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in FIELDS:
+                values[name] = int(rest.split()[0]) * 1024
+    values['Uss'] = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+    return values
+
+
+def children(pid: int) -> list:
+    pids = []
+    for task in os.listdir(f'/proc/{pid}/task'):
+        with open(f'/proc/{pid}/task/{task}/children', 'r') as f:
+            pids.extend(int(child) for child in f.read().split())
+    return pids
+
+
+def command(pid: int) -> str:
+    with open(f'/proc/{pid}/cmdline', 'rb') as f:
+        return f.read().replace(b'\0', b' ').decode(errors='replace').strip()[:60]
+
+
+def mb(value: int) -> str:
+    return f"{value / 1024 / 1024:9.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RSS/PSS/USS of a server process tree')
+    parser.add_argument('pids', type=int, nargs='+', help='Master PID (workers are found automatically), plus extra processes')
+    args = parser.parse_args()
+
+    pids = []
+    for pid in args.pids:
+        pids.append(pid)
+        pids.extend(children(pid))
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        sys.exit("❌ /proc/<pid>/smaps_rollup is not available (Linux 4.14+ required)")
+
+    print(f"{'pid':>8} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'shared MB':>9}  command")
+    totals = {'Rss': 0, 'Pss': 0, 'Uss': 0}
+    for pid in pids:
+        try:
+            memory = read_memory(pid)
+        except OSError as e:
+            print(f"{pid:>8} unreadable: {e}")
+            continue
+        shared = memory.get('Shared_Clean', 0) + memory.get('Shared_Dirty', 0)
+        for key in totals:
+            totals[key] += memory.get(key, 0)
+        print(f"{pid:>8} {mb(memory['Rss'])} {mb(memory['Pss'])} {mb(memory['Uss'])} {mb(shared)}  {command(pid)}")
+    print(f"{'total':>8} {mb(totals['Rss'])} {mb(totals['Pss'])} {mb(totals['Uss'])}")
+    print("\nPSS total is the real footprint; RSS total double-counts pages shared between workers.")
+
+
+if __name__ == "__main__":
+    main()
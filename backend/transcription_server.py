@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Dedicated transcription process
+
+Loads the Whisper model once and serves API workers running with
+TRANSCRIPTION_MODE=ipc over a Unix socket, so only this process holds the weights.
+
+Usage:
+    python transcription_server.py
+    python transcription_server.py --socket /run/pocket/transcription.sock
+"""
+import argparse
+from app.config import settings
+from app.services.transcription import serve
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve Whisper transcriptions over a Unix socket')
+    parser.add_argument('--socket', default=settings.TRANSCRIPTION_SOCKET, help='Unix socket path (TRANSCRIPTION_SOCKET)')
+    args = parser.parse_args()
+    try:
+        serve(args.socket)
+    except KeyboardInterrupt:
+        print("\n⏹️  Transcription server stopped")
+
+
+if __name__ == "__main__":
+    main()
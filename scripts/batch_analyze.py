@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Pocket - Batch Profile Analysis
+Analyze many profiles on pooled browsers, writing NDJSON and resuming after a restart
+
+Usage:
+    python scripts/batch_analyze.py usernames.txt -o results.ndjson --workers 4
+    cat usernames.txt | python scripts/batch_analyze.py - -o results.ndjson
+
+Completed usernames are appended to <output>.checkpoint; rerunning the same
+command skips them (failed usernames are retried unless --skip-failed).
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Set
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.config.settings import get_settings
+from app.scraper.browser_pool import BrowserPool, analyze_profiles
+from app.scraper.metrics import start_metrics_server
+
+
+def normalize(username: str) -> str:
+    return username.strip().lstrip('@').lower()
+
+
+def read_usernames(stream, done: Set[str]) -> Iterator[str]:
+    """Unique, not yet completed usernames (one per line, # comments allowed)"""
+    seen = set()
+    for line in stream:
+        username = normalize(line.split('#', 1)[0])
+        if username and username not in seen and username not in done:
+            seen.add(username)
+            yield username
+
+
+def load_checkpoint(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    with open(path, 'r') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def count_pending(path: str, done: Set[str]) -> int:
+    """Number of usernames left in an input file (None for stdin)"""
+    if path == '-':
+        return None
+    with open(path, 'r') as f:
+        return sum(1 for _ in read_usernames(f, done))
+
+
+def format_duration(seconds: float) -> str:
+    hours, rest = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+class Progress:
+    """Throughput and ETA on stderr, at most every `interval` seconds"""
+
+    def __init__(self, total: int = None, interval: float = 10.0):
+        self.total = total
+        self.interval = interval
+        self.start = time.time()
+        self.last_report = 0.0
+        self.ok = 0
+        self.failed = 0
+
+    def update(self, success: bool):
+        if success:
+            self.ok += 1
+        else:
+            self.failed += 1
+        if time.time() - self.last_report >= self.interval:
+            self.report()
+
+    def report(self):
+        self.last_report = time.time()
+        done = self.ok + self.failed
+        elapsed = time.time() - self.start
+        rate = done / elapsed if elapsed else 0.0
+        line = f"📊 {done}"
+        if self.total:
+            line += f"/{self.total} ({done / self.total:.1%})"
+        line += f" | ✅ {self.ok} ❌ {self.failed} | {rate * 60:.1f} profiles/min | elapsed {format_duration(elapsed)}"
+        if self.total and rate:
+            line += f" | ETA {format_duration((self.total - done) / rate)}"
+        print(line, file=sys.stderr, flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Resumable batch profile analysis')
+    parser.add_argument('input', help='File with one username per line, or - for stdin')
+    parser.add_argument('-o', '--output', required=True, help='NDJSON results file (appended to)')
+    parser.add_argument('--workers', type=int, default=None, help='Parallel browsers (default: BROWSER_POOL_SIZE)')
+    parser.add_argument('--skip-failed', action='store_true', help='Checkpoint failed usernames too (no retry on resume)')
+    parser.add_argument('--progress-interval', type=float, default=10.0, help='Seconds between progress lines')
+    parser.add_argument('--metrics-port', type=int, default=get_settings().metrics_port,
+                        help='Serve Prometheus /metrics on this port while running (0 disables)')
+    args = parser.parse_args()
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    output_path = Path(args.output)
+    checkpoint_path = output_path.with_name(output_path.name + '.checkpoint')
+    done = load_checkpoint(checkpoint_path)
+    if done:
+        print(f"↩️  Resuming: {len(done)} username(s) already completed", file=sys.stderr)
+
+    progress = Progress(count_pending(args.input, done), args.progress_interval)
+    input_stream = sys.stdin if args.input == '-' else open(args.input, 'r')
+
+    try:
+        with open(output_path, 'a') as output, open(checkpoint_path, 'a') as checkpoint, \
+                BrowserPool(size=args.workers) as pool:
+            usernames = read_usernames(input_stream, done)
+            for username, profile_data, error in analyze_profiles(usernames, pool=pool):
+                record = {
+                    'username': username,
+                    'status': 'ok' if error is None else 'error',
+                    'finished_at': datetime.now(timezone.utc).isoformat(),
+                }
+                if error is None:
+                    record['data'] = profile_data
+                else:
+                    record['error'] = f"{type(error).__name__}: {error}"
+                output.write(json.dumps(record, default=str) + '\n')
+                output.flush()
+
+                # Checkpoint only after the result line is written
+                if error is None or args.skip_failed:
+                    checkpoint.write(username + '\n')
+                    checkpoint.flush()
+
+                progress.update(error is None)
+    except KeyboardInterrupt:
+        print("\n⏹️  Interrupted; rerun the same command to resume", file=sys.stderr)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+
+    progress.report()
+    print(f"✅ Done: {progress.ok} succeeded, {progress.failed} failed → {output_path}", file=sys.stderr)
+    sys.exit(1 if progress.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
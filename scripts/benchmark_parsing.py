@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Pocket - Profile Parsing Benchmark
+Micro-benchmarks of the offline parser over the HTML fixtures (or a directory of stored pages)
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.scraper.parsing import (
+    extract_embedded_json, extract_meta_tags, extract_text, parse_meta_tags, parse_number,
+    parse_profile_html, snapshot_from_html
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "profiles"
+
+
+def bench(name: str, func, items, number: int, repeat: int):
+    """Best-of-repeat time for calling func on every item `number` times"""
+    def run():
+        for item in items:
+            func(item)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    calls = number * len(items)
+    per_call_us = best / calls * 1e6
+    print(f"   {name:<22} {per_call_us:>10.1f} µs/call {calls / best:>12,.0f} calls/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline profile parsing")
+    parser.add_argument("--pages", default=str(FIXTURES_DIR), help="Directory of .html pages")
+    parser.add_argument("--number", type=int, default=200, help="Passes over the pages per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="Measurements (best is reported)")
+    args = parser.parse_args()
+
+    pages = [path.read_text(encoding="utf-8") for path in sorted(Path(args.pages).glob("*.html"))]
+    if not pages:
+        print(f"❌ No .html pages in {args.pages}")
+        sys.exit(1)
+
+    total_kb = sum(len(page) for page in pages) / 1024
+    print(f"⏱️  Parsing benchmark: {len(pages)} pages ({total_kb:.1f} KB), best of {args.repeat}")
+    print("=" * 60)
+
+    snapshots = [snapshot_from_html(page) for page in pages]
+    metas = [snapshot['meta'] for snapshot in snapshots]
+    numbers = ['664M', '1.2K', '3,932', '87', '12.5k']
+
+    print("Stages:")
+    bench("parse_number", parse_number, numbers, args.number * 10, args.repeat)
+    bench("extract_meta_tags", extract_meta_tags, pages, args.number, args.repeat)
+    bench("extract_text", extract_text, pages, args.number, args.repeat)
+    bench("extract_embedded_json", extract_embedded_json, pages, args.number, args.repeat)
+    bench("parse_meta_tags", parse_meta_tags, metas, args.number, args.repeat)
+
+    print("End to end:")
+    bench("parse_profile_html", parse_profile_html, pages, args.number, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Pocket - Post Grid Export
+Stream a profile's posts as NDJSON (one post per line, written as soon as it is found)
+
+Usage:
+    python scripts/scrape_posts.py cristiano --max-posts 200 > posts.ndjson
+    python scripts/scrape_posts.py cristiano --since 2024-01-01 | (cd backend && python ingest_videos.py)
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.scraper.instagram_scraper import InstagramScraper
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a profile's post grid as NDJSON")
+    parser.add_argument("username", help="Instagram username (without @)")
+    parser.add_argument("--max-posts", type=int, default=None, help="Stop after this many posts")
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None,
+                        help="Stop at posts older than this date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    count = 0
+    with InstagramScraper() as scraper:
+        for post in scraper.iter_posts(args.username, max_posts=args.max_posts, since=args.since):
+            sys.stdout.write(json.dumps(post, default=str) + "\n")
+            sys.stdout.flush()
+            count += 1
+
+    print(f"✅ {count} posts from @{args.username}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
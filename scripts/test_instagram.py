@@ -5,12 +5,14 @@ Test the modern Instagram scraper that works with current structure
 """
 
 import sys
+import time
 from pathlib import Path
 
 # Add app directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.scraper.instagram_scraper import InstagramScraper, analyze_instagram_profile
+from app.scraper.browser_pool import BrowserPool, analyze_profiles
 
 
 def test_instagram_scraper(username: str):
@@ -54,6 +56,16 @@ def test_instagram_scraper(username: str):
             print(f"\n📱 Posts Data:")
             print(f"   Total posts found: {len(posts)}")
             
+            print(f"\n⏱️  Step Timings:")
+            for step, stats in scraper.timer.summary().items():
+                print(f"   {step:<24} n={stats['count']:<3} mean={stats['mean'] * 1000:7.0f}ms  max={stats['max'] * 1000:7.0f}ms")
+
+            # Compare with BLOCK_RESOURCES_ENABLED=false to measure what blocking saves
+            transfer = scraper.transfer.summary()
+            print(f"\n📦 Transfer per page (blocking {'on' if scraper.settings.block_resources_enabled else 'off'}):")
+            print(f"   {transfer['mean_bytes'] / 1024:.0f}KB mean, {transfer['max_bytes'] / 1024:.0f}KB max, "
+                  f"{transfer['mean_requests']:.0f} requests over {transfer['pages']} page(s)")
+            
             print("\n🎉 Instagram scraper test passed!")
             return True
             
@@ -108,6 +120,37 @@ def test_multiple_profiles():
         return False
 
 
+def test_browser_pool(pool_size: int):
+    """
+    Test concurrent analysis on pooled browsers
+    """
+    print(f"\n🔄 Testing Browser Pool ({pool_size} browsers)")
+    print("=" * 60)
+    
+    test_profiles = ['cristiano', 'instagram', 'natgeo', 'nasa', 'nike', 'leomessi']
+    
+    try:
+        start = time.time()
+        results = []
+        with BrowserPool(size=pool_size) as pool:
+            for profile, profile_data, error in analyze_profiles(test_profiles, pool=pool):
+                if error:
+                    print(f"   ❌ @{profile}: {error}")
+                    results.append(False)
+                else:
+                    print(f"   ✅ @{profile}: {profile_data['profile_info']['followers']:,} followers")
+                    results.append(True)
+            print(f"   📊 Pool stats: {pool.stats}")
+        
+        elapsed = time.time() - start
+        print(f"\n⏱️  {len(test_profiles)} profiles in {elapsed:.1f}s ({elapsed / len(test_profiles):.1f}s/profile)")
+        return all(results)
+        
+    except Exception as e:
+        print(f"\n❌ Browser pool test failed: {e}")
+        return False
+
+
 def test_convenience_function(username: str):
     """
     Test the convenience function
@@ -133,6 +176,7 @@ def main():
     parser.add_argument('username', help='Instagram username to test (without @)')
     parser.add_argument('--test-multiple', action='store_true', help='Test multiple profiles')
     parser.add_argument('--test-convenience', action='store_true', help='Test convenience function')
+    parser.add_argument('--test-pool', type=int, metavar='SIZE', help='Test concurrent analysis with a browser pool of SIZE')
     
     args = parser.parse_args()
     
@@ -152,8 +196,13 @@ def main():
     if args.test_convenience:
         success3 = test_convenience_function(args.username)
     
+    # Test browser pool if requested
+    success4 = True
+    if args.test_pool:
+        success4 = test_browser_pool(args.test_pool)
+    
     # Final result
-    if success1 and success2 and success3:
+    if success1 and success2 and success3 and success4:
         print("\n🎯 INSTAGRAM SCRAPER TESTS PASSED!")
         print("✅ Instagram scraper is working")
         print("✅ Session persistence is working")
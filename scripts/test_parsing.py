@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Pocket - Profile Parsing Test
+Check the offline parser against the saved HTML fixtures (no Chrome or network needed);
+runs standalone or under pytest
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import List
+
+# Add app directory to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.scraper.parsing import detect_block, parse_number, parse_snapshot, snapshot_from_html
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "profiles"
+
+NUMBER_CASES = {
+    '664M': 664000000,
+    '1.2K': 1200,
+    '3,932': 3932,
+    '12.5k': 12500,
+    '2B': 2000000000,
+    '87': 87,
+    '': 0,
+    'n/a': 0,
+}
+
+
+def number_failures() -> List[str]:
+    """parse_number results that differ from NUMBER_CASES"""
+    failures = []
+    for value, expected in NUMBER_CASES.items():
+        result = parse_number(value)
+        if result != expected:
+            failures.append(f"parse_number({value!r}) = {result}, expected {expected}")
+    return failures
+
+
+def fixture_failures(page: Path) -> List[str]:
+    """
+    Differences between the parse of one fixture page and its expected .json.
+    A fixture expecting {"blocked": "<kind>"} is a block page that must be detected
+    as such instead of parsing as a (empty) profile.
+    """
+    expected = json.loads(page.with_suffix(".json").read_text(encoding="utf-8"))
+    snapshot = snapshot_from_html(page.read_text(encoding="utf-8"))
+    block = detect_block(snapshot)
+    if block != expected.get('blocked'):
+        return [f"blocked: got {block!r}, expected {expected.get('blocked')!r}"]
+    if block:
+        return []
+
+    result = parse_snapshot(snapshot)
+    if result is None:
+        return ["parser returned no profile"]
+    profile_info = result['profile_info']
+    return [
+        f"{field}: got {profile_info.get(field)!r}, expected {expected[field]!r}"
+        for field in expected if profile_info.get(field) != expected[field]
+    ]
+
+
+def test_parse_number():
+    failures = number_failures()
+    assert not failures, "\n".join(failures)
+
+
+def test_fixtures():
+    pages = sorted(FIXTURES_DIR.glob("*.html"))
+    assert pages, f"No fixtures in {FIXTURES_DIR}"
+    failures = [f"{page.stem}: {failure}" for page in pages for failure in fixture_failures(page)]
+    assert not failures, "\n".join(failures)
+
+
+def main():
+    print("🧪 Testing Profile Parsing")
+    print("=" * 60)
+
+    print("1️⃣ Testing number parsing...")
+    failures = number_failures()
+    for failure in failures:
+        print(f"   ❌ {failure}")
+    if not failures:
+        print(f"   ✅ {len(NUMBER_CASES)} cases passed")
+
+    print("2️⃣ Testing HTML fixtures...")
+    for page in sorted(FIXTURES_DIR.glob("*.html")):
+        page_failures = fixture_failures(page)
+        print(f"   {'❌' if page_failures else '✅'} {page.stem}")
+        for failure in page_failures:
+            print(f"      {failure}")
+        failures += page_failures
+
+    print("\n" + "=" * 60)
+    if failures:
+        print(f"❌ {failures} check(s) failed")
+        sys.exit(1)
+    print("🎉 All parsing checks passed!")
+
+
+if __name__ == "__main__":
+    main()